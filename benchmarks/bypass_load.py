@@ -0,0 +1,139 @@
+"""
+Load test for the Cloudflare bypass server
+
+Sends `--requests` calls to the bypass server's /cookies endpoint,
+`--concurrency` at a time, against the local challenge stand-in
+(dsk/challenge_standin.py, started in-process unless --url is given) and
+reports:
+
+- bypasses per minute, counting only responses that carry a cf_clearance
+- p50/p95 latency overall and per phase (launch, load, solve, cookies), from
+  the X-Bypass-Profile header server.py attaches
+- browser memory per bypass, when psutil is installed next to the server
+
+Start the server with local targets allowed first:
+    cd dsk && ALLOW_LOCAL_URLS=true python server.py
+
+Usage (from the repository root):
+    python -m benchmarks.bypass_load --requests 20 --concurrency 2
+    python -m benchmarks.bypass_load --widget-delay 3 --json results.jsonl
+"""
+
+import argparse
+import json
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dsk.challenge_standin import ChallengeStandin, serve
+
+PHASES = ('launch', 'load', 'solve', 'cookies', 'total')
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+def bypass(server: str, url: str, retries: int) -> Dict[str, Any]:
+    query = urllib.parse.urlencode({'url': url, 'retries': retries})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(f"{server.rstrip('/')}/cookies?{query}") as response:
+            body = json.load(response)
+            profile = json.loads(response.headers.get('X-Bypass-Profile') or '{}')
+    except urllib.error.HTTPError as e:
+        return {'ok': False, 'latency': time.perf_counter() - started, 'error': f"HTTP {e.code}: {e.read()[:200]!r}"}
+    except OSError as e:
+        return {'ok': False, 'latency': time.perf_counter() - started, 'error': str(e)}
+
+    return {
+        'ok': bool(body.get('cookies', {}).get('cf_clearance', '').strip()),
+        'latency': time.perf_counter() - started,
+        'profile': profile,
+    }
+
+def run(server: str, url: str, requests: int, concurrency: int, retries: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        samples = list(pool.map(lambda _: bypass(server, url, retries), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    passed = [s for s in samples if s['ok']]
+    errors = sorted({s['error'] for s in samples if 'error' in s})
+
+    results: Dict[str, Any] = {
+        'requests': requests,
+        'concurrency': concurrency,
+        'succeeded': len(passed),
+        'bypasses_per_min': len(passed) / elapsed * 60,
+    }
+
+    latencies = [s['latency'] for s in passed]
+    results['latency_p50_s'] = percentile(latencies, 0.5)
+    results['latency_p95_s'] = percentile(latencies, 0.95)
+    for phase in PHASES:
+        values = [s['profile'][phase] for s in passed if phase in s['profile']]
+        results[f'{phase}_p50_s'] = percentile(values, 0.5)
+        results[f'{phase}_p95_s'] = percentile(values, 0.95)
+
+    attempts = [s['profile'].get('load_attempts', 1) for s in passed]
+    results['load_attempts_mean'] = sum(attempts) / len(attempts) if attempts else None
+
+    memory = [s['profile']['browser_rss_bytes'] for s in passed if s['profile'].get('browser_rss_bytes')]
+    results['browser_rss_mb_mean'] = sum(memory) / len(memory) / 2**20 if memory else None
+    results['browser_rss_mb_max'] = max(memory) / 2**20 if memory else None
+
+    if errors:
+        results['errors'] = errors
+    return results
+
+def revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Cloudflare bypass server")
+    parser.add_argument("--server", default="http://localhost:8000", help="Bypass server base URL")
+    parser.add_argument("--url", help="Challenge page to bypass; the local stand-in if omitted")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--retries", type=int, default=5, help="Click attempts per bypass")
+    parser.add_argument("--widget-delay", type=float, default=1.0, help="Stand-in seconds before the checkbox appears")
+    parser.add_argument("--json", help="Append results to this JSON lines file")
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        standin = serve(ChallengeStandin(widget_delay=args.widget_delay), port=0)
+        threading.Thread(target=standin.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{standin.server_address[1]}/"
+
+    results = run(args.server, url, args.requests, args.concurrency, args.retries)
+
+    for name, value in results.items():
+        if isinstance(value, float):
+            print(f"{name:<22} {value:>12,.3f}")
+        elif isinstance(value, list):
+            print(f"{name:<22} {'; '.join(value)}")
+        else:
+            print(f"{name:<22} {'-' if value is None else value:>12}")
+
+    if args.json:
+        record = {'revision': revision(), 'url': args.url or f'standin:{args.widget_delay}',
+                  'timestamp': int(time.time()), **results}
+        with open(args.json, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+if __name__ == "__main__":
+    main()
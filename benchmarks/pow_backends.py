@@ -0,0 +1,108 @@
+"""
+Cross-check and benchmark the PoW backends
+
+Differential check: the native backend must agree with the WASM module on
+DeepSeekHashV1 digests of random messages (including multi-block ones) and on
+the answers to randomly generated challenges, solvable or not. Challenges are
+generated with the WASM hash, so the reference stays the original module.
+
+Benchmark: solves per second and hashes per second of each backend at each
+difficulty.
+
+Usage (from the repository root):
+    python -m benchmarks.pow_backends --verify 200
+    python -m benchmarks.pow_backends --difficulties 1000 10000 144000 --rounds 5
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from typing import Any, Dict, List
+
+from dsk.pow import DeepSeekHash, DeepSeekPOW, WASM_PATH
+from dsk.pow_native import NativeHash, deepseek_hash_v1
+
+ALGORITHM = 'DeepSeekHashV1'
+
+def generate_challenges(wasm: DeepSeekHash, count: int, difficulty: int,
+                        rng: random.Random, unsolvable: float = 0.1) -> List[Dict[str, Any]]:
+    challenges = []
+    for _ in range(count):
+        salt      = ''.join(rng.choice('0123456789abcdef') for _ in range(rng.choice([16, 32, 64])))
+        expire_at = rng.randrange(10 ** 12, 10 ** 13)
+        if rng.random() < unsolvable:
+            answer = difficulty + rng.randrange(1000)
+        else:
+            answer = rng.randrange(difficulty)
+        challenges.append({
+            'algorithm': ALGORITHM,
+            'challenge': wasm.hash(f"{salt}_{expire_at}_{answer}"),
+            'salt': salt,
+            'difficulty': difficulty,
+            'expire_at': expire_at,
+            'answer': answer if answer < difficulty else None,
+        })
+    return challenges
+
+def solve(hasher, config: Dict[str, Any]):
+    return hasher.calculate_hash(config['algorithm'], config['challenge'], config['salt'],
+                                 config['difficulty'], config['expire_at'])
+
+def verify(count: int, seed: int) -> bool:
+    rng    = random.Random(seed)
+    wasm   = DeepSeekHash().init(WASM_PATH)
+    native = NativeHash()
+    failures = 0
+
+    for _ in range(count):
+        length = rng.randrange(0, 400)
+        text = ''.join(rng.choice(string.printable) for _ in range(length))
+        expected, actual = wasm.hash(text), deepseek_hash_v1(text.encode())
+        if expected != actual:
+            failures += 1
+            print(f"hash mismatch for {text!r}: wasm={expected} native={actual}")
+
+    for difficulty in (10, 1000, 20000):
+        for config in generate_challenges(wasm, max(1, count // 10), difficulty, rng):
+            expected, actual = solve(wasm, config), solve(native, config)
+            if expected != actual or expected != config['answer']:
+                failures += 1
+                print(f"solve mismatch at difficulty {difficulty}: "
+                      f"wasm={expected} native={actual} generated={config['answer']}")
+
+    print(f"differential check: {'OK' if not failures else f'{failures} failures'}")
+    return not failures
+
+def benchmark(difficulties: List[int], rounds: int, seed: int) -> None:
+    rng  = random.Random(seed)
+    wasm = DeepSeekHash().init(WASM_PATH)
+    backends = {name: DeepSeekPOW(backend=name).hasher for name in DeepSeekPOW.BACKENDS}
+
+    print(f"{'backend':<8} {'difficulty':>10} {'solves/s':>10} {'hashes/s':>12}")
+    for difficulty in difficulties:
+        challenges = generate_challenges(wasm, rounds, difficulty, rng, unsolvable=0)
+        for name, hasher in backends.items():
+            started = time.perf_counter()
+            hashes  = 0
+            for config in challenges:
+                answer = solve(hasher, config)
+                hashes += answer + 1
+            elapsed = time.perf_counter() - started
+            print(f"{name:<8} {difficulty:>10} {rounds / elapsed:>10.2f} {hashes / elapsed:>12.0f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cross-check and benchmark PoW backends")
+    parser.add_argument("--verify", type=int, metavar="N", help="Run the differential check with N random messages")
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[1000, 10000, 144000])
+    parser.add_argument("--rounds", type=int, default=5, help="Challenges solved per difficulty")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(0 if verify(args.verify, args.seed) else 1)
+    benchmark(args.difficulties, args.rounds, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Startup benchmark for short-lived processes
+
+Each sample runs in a fresh interpreter and times the phases a CLI tool or a
+serverless worker pays on every invocation: importing dsk.api, constructing
+DeepSeekAPI, and the first PoW solve (which compiles the WASM module) compared
+to a warm one.
+
+Usage (from the repository root):
+    python -m benchmarks.startup --samples 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE = r'''
+import json, time
+t0 = time.perf_counter()
+import dsk.api
+t1 = time.perf_counter()
+api = dsk.api.DeepSeekAPI("benchmark-token")
+t2 = time.perf_counter()
+api.pow_solver.solve_challenge(CHALLENGE)
+t3 = time.perf_counter()
+api.pow_solver.solve_challenge(CHALLENGE)
+t4 = time.perf_counter()
+print(json.dumps({
+    "import dsk.api": t1 - t0,
+    "DeepSeekAPI()": t2 - t1,
+    "first solve": t3 - t2,
+    "warm solve": t4 - t3,
+}))
+'''
+
+def make_challenge(difficulty: int) -> dict:
+    from dsk.pow_native import deepseek_hash_v1
+
+    salt, expire_at, answer = 'benchmark', 1700000000000, difficulty - 1
+    return {
+        'algorithm': 'DeepSeekHashV1',
+        'challenge': deepseek_hash_v1(f"{salt}_{expire_at}_{answer}".encode()),
+        'salt': salt,
+        'difficulty': difficulty,
+        'expire_at': expire_at,
+        'signature': 'benchmark',
+        'target_path': '/api/v0/chat/completion',
+    }
+
+def run_sample(challenge: dict) -> dict:
+    code = f"CHALLENGE = {challenge!r}\n{SAMPLE}"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark import time and first request cost")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--difficulty", type=int, default=1000, help="Difficulty of the solved challenge")
+    args = parser.parse_args()
+
+    challenge = make_challenge(args.difficulty)
+    samples = [run_sample(challenge) for _ in range(args.samples)]
+
+    print(f"{'phase':<16} {'median ms':>10} {'max ms':>10}")
+    for phase in samples[0]:
+        values = [sample[phase] * 1000 for sample in samples]
+        print(f"{phase:<16} {statistics.median(values):>10.1f} {max(values):>10.1f}")
+
+if __name__ == "__main__":
+    main()
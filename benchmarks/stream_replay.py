@@ -0,0 +1,175 @@
+"""
+Streaming client benchmark on recorded traces
+
+Replays a /chat/completion trace through DeepSeekAPI with ReplayTransport and
+reports, per run:
+
+- chunks/s for the raw line iteration, for _parse_chunk alone and end to end
+  through chat_completion()
+- client overhead per chunk on top of raw iteration, in microseconds
+- memory blocks and bytes allocated per chunk (a tracemalloc snapshot diff
+  around one completion whose chunks are kept), with the replayed responses
+  built before tracing starts so only the client is counted
+
+Record a real trace with DeepSeekAPI(token, capture="completion.jsonl.gz"), or
+let the benchmark synthesize one. Results can be appended to a JSON lines file
+to compare releases.
+
+Usage (from the repository root):
+    python -m benchmarks.stream_replay --chunks 5000
+    python -m benchmarks.stream_replay --trace completion.jsonl.gz --json results.jsonl
+"""
+
+import argparse
+import json
+import subprocess
+import gc
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from dsk.api import DeepSeekAPI
+from dsk.transport import ReplayResponse, ReplayTransport, load_trace
+
+COMPLETION_PATH = '/api/v0/chat/completion'
+
+class _TracePOW:
+    """Recorded challenges have long expired; replays only need some answer"""
+
+    def solve_challenge(self, config: Dict[str, Any]) -> str:
+        return 'replay'
+
+class _PreparedTransport(ReplayTransport):
+    """ReplayTransport that serves responses built ahead of time by prepare()"""
+
+    def __init__(self, trace: List[Dict[str, Any]]):
+        super().__init__(trace)
+        self._prepared = defaultdict(deque)
+
+    def prepare(self) -> None:
+        """Build one response per exchange, to be served before any new ones"""
+        for key, exchanges in self._exchanges.items():
+            for exchange in exchanges:
+                self._prepared[key].append(ReplayResponse(exchange, self.speed))
+
+    def request(self, method: str, url: str, **kwargs: Any) -> ReplayResponse:
+        prepared = self._prepared.get((method.upper(), urlsplit(url).path))
+        if prepared:
+            return prepared.popleft()
+        return super().request(method, url, **kwargs)
+
+def synthetic_trace(chunks: int) -> List[Dict[str, Any]]:
+    """A trace shaped like a thinking-enabled answer of `chunks` tokens"""
+    words = "the model considers each part of the question before it writes an answer".split()
+    lines = []
+    for i in range(chunks):
+        kind = 'thinking' if i < chunks // 2 else 'text'
+        delta = {'content': f' {words[i % len(words)]}', 'type': kind}
+        choice = {'index': 0, 'delta': delta}
+        if i == chunks - 1:
+            choice['finish_reason'] = 'stop'
+        lines.append([i * 0.02, 'data: ' + json.dumps({'choices': [choice]})])
+        lines.append([i * 0.02, ''])
+
+    return [
+        {'method': 'POST', 'path': '/api/v0/chat/create_pow_challenge', 'status': 200, 'headers': {},
+         'body': json.dumps({'data': {'biz_data': {'challenge': {}}}})},
+        {'method': 'POST', 'path': COMPLETION_PATH, 'status': 200, 'headers': {}, 'lines': lines},
+    ]
+
+def run_completion(api: DeepSeekAPI) -> int:
+    return sum(1 for _ in api.chat_completion('replay-session', 'replay prompt'))
+
+def measure_allocations(api: DeepSeekAPI) -> Dict[str, float]:
+    """Blocks and bytes one completion allocates per chunk, counting the chunks it yields
+
+    The chunks are kept until the second snapshot so they count as
+    allocations; memory the client frees again before yielding does not.
+    """
+    api.transport.prepare()
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        chunks = list(api.chat_completion('replay-session', 'replay prompt'))
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'filename')
+    return {
+        'blocks_per_chunk': sum(stat.count_diff for stat in stats) / len(chunks),
+        'bytes_per_chunk': sum(stat.size_diff for stat in stats) / len(chunks),
+    }
+
+def measure(exchanges: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    completion = next(e for e in exchanges if e['path'].split('?')[0] == COMPLETION_PATH)
+    raw_lines = [line.encode('utf-8') for _, line in completion['lines']]
+
+    api = DeepSeekAPI('replay-token', transport=_PreparedTransport(exchanges), pow_solver=_TracePOW())
+    api.cookies = {}
+    chunks = run_completion(api)  # warm up imports and caches
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _ in ReplayTransport(exchanges).request('POST', COMPLETION_PATH).iter_lines():
+            pass
+    raw = (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for line in raw_lines:
+            api._parse_chunk(line)
+    parse = (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run_completion(api)
+    end_to_end = (time.perf_counter() - started) / repeat
+
+    allocations = measure_allocations(api)
+
+    return {
+        'chunks': chunks,
+        'raw_chunks_per_s': chunks / raw,
+        'parse_chunks_per_s': chunks / parse,
+        'end_to_end_chunks_per_s': chunks / end_to_end,
+        'overhead_us_per_chunk': (end_to_end - raw) / chunks * 1e6,
+        **allocations,
+    }
+
+def revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming client on recorded traces")
+    parser.add_argument("--trace", help="Trace recorded with DeepSeekAPI(capture=...)")
+    parser.add_argument("--chunks", type=int, default=2000, help="Size of the synthetic trace if no --trace")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Append results to this JSON lines file")
+    args = parser.parse_args()
+
+    exchanges = load_trace(args.trace) if args.trace else synthetic_trace(args.chunks)
+    results = measure(exchanges, args.repeat)
+
+    for name, value in results.items():
+        print(f"{name:<26} {value:>14,.1f}")
+
+    if args.json:
+        record = {'revision': revision(), 'trace': args.trace or f'synthetic:{args.chunks}',
+                  'timestamp': int(time.time()), **results}
+        with open(args.json, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+if __name__ == "__main__":
+    main()
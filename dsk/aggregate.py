@@ -0,0 +1,215 @@
+"""
+Aggregation of chat_completion streams
+
+StreamAggregator turns the chunks chat_completion() yields into the thinking
+and answer text, built incrementally in string buffers, with optional
+callbacks for every finished segment (a run of thinking or of answer text)
+and every finished sentence. The CompletionResult at the end carries the
+text, search citations, timing and token counts.
+
+Memory stays proportional to the text: chunks are not kept, and sentence and
+segment buffers only hold the text that hasn't been delivered yet.
+
+    result = aggregate(api.chat_completion(chat_id, prompt),
+                       on_sentence=lambda kind, sentence: print(kind, sentence))
+    print(result.text, result.time_to_first_token)
+"""
+
+import io
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+THINKING = 'thinking'
+TEXT     = 'text'
+
+# Sentence terminators; Latin ones end a sentence only once whitespace follows
+_TERMINALS     = frozenset('.!?…')
+_CJK_TERMINALS = frozenset('。！？')
+_CLOSERS       = frozenset('"\')]}»”’')
+
+SegmentCallback  = Callable[[str, str], None]
+SentenceCallback = Callable[[str, str], None]
+
+@dataclass(frozen=True)
+class Citation:
+    url: str
+    title: str = ''
+    snippet: str = ''
+    index: Optional[int] = None
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> 'Citation':
+        return cls(
+            url=result.get('url', ''),
+            title=result.get('title') or '',
+            snippet=result.get('snippet') or '',
+            index=result.get('cite_index'),
+        )
+
+@dataclass(frozen=True)
+class CompletionResult:
+    thinking: str
+    text: str
+    citations: List[Citation] = field(default_factory=list)
+    finish_reason: Optional[str] = None
+    # Content chunks; the server sends one per token
+    thinking_tokens: int = 0
+    text_tokens: int = 0
+    # Seconds from the start of the request
+    time_to_first_token: Optional[float] = None
+    time_to_first_text: Optional[float] = None
+    elapsed: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return self.thinking_tokens + self.text_tokens
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generation rate after the first token"""
+        if self.time_to_first_token is None or self.elapsed <= self.time_to_first_token:
+            return None
+        return self.tokens / (self.elapsed - self.time_to_first_token)
+
+class _Part:
+    """Buffers for one kind of content"""
+
+    __slots__ = ('buffer', 'tokens', 'sentence', 'after_terminal')
+
+    def __init__(self):
+        self.buffer         = io.StringIO()
+        self.tokens         = 0
+        self.sentence: List[str] = []
+        self.after_terminal = False
+
+class StreamAggregator:
+    def __init__(self,
+                 on_segment: Optional[SegmentCallback] = None,
+                 on_sentence: Optional[SentenceCallback] = None):
+        """
+        Args:
+            on_segment: Called with (kind, text) when a run of thinking or answer text ends
+            on_sentence: Called with (kind, sentence) for every finished sentence or line
+        """
+        self.on_segment  = on_segment
+        self.on_sentence = on_sentence
+
+        self.started = time.perf_counter()
+        self._parts  = {THINKING: _Part(), TEXT: _Part()}
+        self._citations: Dict[str, Citation] = {}
+        self._kind: Optional[str] = None
+        self._segment: List[str] = []
+        self._finish_reason: Optional[str] = None
+        self._first_token: Optional[float] = None
+        self._first_text: Optional[float] = None
+        self._elapsed: Optional[float] = None
+
+    def feed(self, chunk: Dict[str, Any]) -> None:
+        """Add one parsed chunk from chat_completion()"""
+        for result in chunk.get('search_results') or ():
+            url = result.get('url')
+            if url and url not in self._citations:
+                self._citations[url] = Citation.from_result(result)
+
+        if chunk.get('finish_reason'):
+            self._finish_reason = chunk['finish_reason']
+
+        kind = chunk.get('type')
+        content = chunk.get('content')
+        if kind not in self._parts or not content:
+            return
+
+        now = time.perf_counter() - self.started
+        if self._first_token is None:
+            self._first_token = now
+        if kind == TEXT and self._first_text is None:
+            self._first_text = now
+
+        part = self._parts[kind]
+        part.buffer.write(content)
+        part.tokens += 1
+
+        if kind != self._kind:
+            self._end_segment()
+            self._kind = kind
+
+        if self.on_segment:
+            self._segment.append(content)
+
+        if self.on_sentence:
+            self._split_sentences(kind, part, content)
+
+    def consume(self, chunks: Iterable[Dict[str, Any]]) -> CompletionResult:
+        """Feed a whole stream and return the result; timing starts at the first request"""
+        self.started = time.perf_counter()
+        for chunk in chunks:
+            self.feed(chunk)
+        return self.result()
+
+    def result(self) -> CompletionResult:
+        """Flush pending callbacks and return the result so far"""
+        self._end_segment()
+
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self.started
+
+        return CompletionResult(
+            thinking=self._parts[THINKING].buffer.getvalue(),
+            text=self._parts[TEXT].buffer.getvalue(),
+            citations=list(self._citations.values()),
+            finish_reason=self._finish_reason,
+            thinking_tokens=self._parts[THINKING].tokens,
+            text_tokens=self._parts[TEXT].tokens,
+            time_to_first_token=self._first_token,
+            time_to_first_text=self._first_text,
+            elapsed=self._elapsed,
+        )
+
+    def _end_segment(self) -> None:
+        """Deliver the segment and any unfinished sentence of the current kind"""
+        if self._kind is None:
+            return
+        if self.on_sentence:
+            part = self._parts[self._kind]
+            self._emit_sentence(self._kind, part)
+            part.after_terminal = False
+        if self._segment:
+            self.on_segment(self._kind, ''.join(self._segment))
+            self._segment = []
+        self._kind = None
+
+    def _split_sentences(self, kind: str, part: _Part, content: str) -> None:
+        # Scans only the new content; whether a Latin terminator ends the
+        # sentence is carried over in case the whitespace comes next chunk
+        start = 0
+        for i, char in enumerate(content):
+            if char == '\n' or (part.after_terminal and char.isspace()):
+                part.sentence.append(content[start:i])
+                self._emit_sentence(kind, part)
+                start = i + 1
+                part.after_terminal = False
+            elif char in _CJK_TERMINALS:
+                part.sentence.append(content[start:i + 1])
+                self._emit_sentence(kind, part)
+                start = i + 1
+                part.after_terminal = False
+            elif char in _TERMINALS:
+                part.after_terminal = True
+            elif char not in _CLOSERS:
+                part.after_terminal = False
+
+        if start < len(content):
+            part.sentence.append(content[start:])
+
+    def _emit_sentence(self, kind: str, part: _Part) -> None:
+        sentence = ''.join(part.sentence).strip()
+        part.sentence = []
+        if sentence:
+            self.on_sentence(kind, sentence)
+
+def aggregate(chunks: Iterable[Dict[str, Any]],
+              on_segment: Optional[SegmentCallback] = None,
+              on_sentence: Optional[SentenceCallback] = None) -> CompletionResult:
+    """Consume a chat_completion() stream into a CompletionResult"""
+    return StreamAggregator(on_segment, on_sentence).consume(chunks)
@@ -1,84 +1,164 @@
-from curl_cffi import requests
-from typing import Optional, Dict, Any, Generator, Literal
+from typing import Optional, Dict, Any, Generator, Literal, Callable, TypeVar, List, Union
 import json
+import mimetypes
+from urllib.parse import urlencode
 from .pow import DeepSeekPOW
-import pkg_resources
+from .exceptions import (
+    DeepSeekError,
+    AuthenticationError,
+    RateLimitError,
+    NetworkError,
+    CloudflareError,
+    CircuitOpenError,
+    APIError,
+)
+from .metrics import Metrics
+from .cache import ResponseCache
+from .uploads import UploadIndex, file_digest, account_key
+from .fingerprint import FingerprintProfile, DEFAULT_PROFILE
+from .transport import CurlTransport, RecordingTransport, curl_requests
+from .retry import RetryPolicy, CircuitBreaker
 import sys
 from pathlib import Path
 import subprocess
+import threading
 import time
 
+__all__ = [
+    'DeepSeekAPI',
+    'ThinkingMode',
+    'SearchMode',
+    'DeepSeekError',
+    'AuthenticationError',
+    'RateLimitError',
+    'NetworkError',
+    'CloudflareError',
+    'CircuitOpenError',
+    'APIError',
+]
+
 ThinkingMode = Literal['detailed', 'simple', 'disabled']
 SearchMode = Literal['enabled', 'disabled']
 
-class DeepSeekError(Exception):
-    """Base exception for all DeepSeek API errors"""
-    pass
-
-class AuthenticationError(DeepSeekError):
-    """Raised when authentication fails"""
-    pass
-
-class RateLimitError(DeepSeekError):
-    """Raised when API rate limit is exceeded"""
-    pass
-
-class NetworkError(DeepSeekError):
-    """Raised when network communication fails"""
-    pass
-
-class CloudflareError(DeepSeekError):
-    """Raised when Cloudflare blocks the request"""
-    pass
+T = TypeVar('T')
 
-class APIError(DeepSeekError):
-    """Raised when API returns an error response"""
-    def __init__(self, message: str, status_code: Optional[int] = None):
-        super().__init__(message)
-        self.status_code = status_code
+COOKIES_PATH = Path(__file__).parent / 'cookies.json'
+UPLOADS_PATH = Path(__file__).parent / 'uploads.json'
 
 class DeepSeekAPI:
     BASE_URL = "https://chat.deepseek.com/api/v0"
 
-    def __init__(self, auth_token: str):
+    def __init__(self,
+                 auth_token: str,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 metrics: Optional[Metrics] = None,
+                 pow_solver: Optional[Any] = None,
+                 cache: Optional[ResponseCache] = None,
+                 upload_index: Optional[UploadIndex] = None,
+                 fingerprint: Optional[FingerprintProfile] = None,
+                 transport: Optional[Any] = None,
+                 capture: Optional[Union[str, Path]] = None):
         if not auth_token or not isinstance(auth_token, str):
             raise AuthenticationError("Invalid auth token provided")
 
-        try:
-            curl_cffi_version = pkg_resources.get_distribution('curl-cffi').version
-            if curl_cffi_version != '0.8.1b9':
-                print("\033[93mWarning: DeepSeek API requires curl-cffi version 0.8.1b9", file=sys.stderr)
-                print("Please install the correct version using: pip install curl-cffi==0.8.1b9\033[0m", file=sys.stderr)
-        except pkg_resources.DistributionNotFound:
-            print("\033[93mWarning: curl-cffi not found. Please install version 0.8.1b9:", file=sys.stderr)
-            print("pip install curl-cffi==0.8.1b9\033[0m", file=sys.stderr)
-
         self.auth_token = auth_token
-        self.pow_solver = DeepSeekPOW()
-
-        # Load cookies from JSON file
-        cookies_path = Path(__file__).parent / 'cookies.json'
+        # Anything with a DeepSeekPOW-compatible solve_challenge(), e.g. dsk.pow_server.RemotePOW
+        # The WASM module is compiled on first solve or on warmup()
+        self.pow_solver = pow_solver or DeepSeekPOW()
+        self.metrics = metrics or Metrics()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        if self.circuit_breaker.metrics is None:
+            self.circuit_breaker.metrics = self.metrics
+        self._retry_scope = threading.local()
+        self.cache = cache
+        # capture records every exchange to a trace file for ReplayTransport
+        self.transport = transport or CurlTransport()
+        if getattr(self.transport, 'metrics', False) is None:
+            self.transport.metrics = self.metrics
+        if capture is not None:
+            self.transport = RecordingTransport(capture, self.transport)
+        self.upload_index = upload_index or UploadIndex(UPLOADS_PATH)
+
+        # Loaded from COOKIES_PATH on first use, together with the fingerprint
+        # profile of the browser that obtained them unless one is pinned here
+        self._cookies: Optional[Dict[str, str]] = None
+        self._fingerprint: Optional[FingerprintProfile] = None
+        self._pinned_fingerprint = fingerprint
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        if self._cookies is None:
+            self._load_cookies()
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, value: Dict[str, str]) -> None:
+        self._cookies = value
+
+    @property
+    def fingerprint(self) -> FingerprintProfile:
+        """Browser profile presented with the cookies on every request"""
+        if self._pinned_fingerprint is not None:
+            return self._pinned_fingerprint
+        if self._fingerprint is None:
+            if self._cookies is None:
+                self._load_cookies()
+            else:
+                # Cookies were assigned directly, without a browser profile
+                self._fingerprint = DEFAULT_PROFILE
+        return self._fingerprint
+
+    def _load_cookies(self) -> None:
+        """Load cookies and the matching fingerprint profile from JSON file"""
         try:
-            with open(cookies_path, 'r') as f:
+            with open(COOKIES_PATH, 'r') as f:
                 cookie_data = json.load(f)
-                self.cookies = cookie_data.get('cookies', {})
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"\033[93mWarning: Could not load cookies from {cookies_path}: {e}\033[0m", file=sys.stderr)
-            self.cookies = {}
+            print(f"\033[93mWarning: Could not load cookies from {COOKIES_PATH}: {e}\033[0m", file=sys.stderr)
+            cookie_data = {}
+
+        self._cookies = cookie_data.get('cookies', {})
+        if cookie_data.get('fingerprint'):
+            self._fingerprint = FingerprintProfile.from_dict(cookie_data['fingerprint'])
+        elif cookie_data.get('user_agent'):
+            # cookies.json written before profiles were saved alongside
+            self._fingerprint = FingerprintProfile.from_user_agent(cookie_data['user_agent'])
+        else:
+            self._fingerprint = DEFAULT_PROFILE
+
+    def warmup(self) -> None:
+        """Do the one-off startup work now instead of on the first request:
+        import curl_cffi, load cookies and compile the PoW solver"""
+        curl_requests()
+        self._load_cookies()
+        if hasattr(self.pow_solver, 'warmup'):
+            self.pow_solver.warmup()
+
+    def close(self) -> None:
+        """Close the transport, finishing the capture file if recording"""
+        if hasattr(self.transport, 'close'):
+            self.transport.close()
+
+    def __enter__(self) -> 'DeepSeekAPI':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _get_headers(self, pow_response: Optional[str] = None) -> Dict[str, str]:
         headers = {
             'accept': '*/*',
-            'accept-language': 'en,fr-FR;q=0.9,fr;q=0.8,es-ES;q=0.7,es;q=0.6,en-US;q=0.5,am;q=0.4,de;q=0.3',
             'authorization': f'Bearer {self.auth_token}',
             'content-type': 'application/json',
             'origin': 'https://chat.deepseek.com',
             'referer': 'https://chat.deepseek.com/',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
-            'x-app-version': '20241129.1',
             'x-client-locale': 'en_US',
             'x-client-platform': 'web',
             'x-client-version': '1.0.0-always',
+            # user-agent, client hints, accept-language and x-app-version
+            **self.fingerprint.headers(),
         }
 
         if pow_response:
@@ -98,22 +178,117 @@ class DeepSeekAPI:
             # Wait briefly for cookies file to be written
             time.sleep(2)
 
-            # Reload cookies
-            cookies_path = Path(__file__).parent / 'cookies.json'
-            with open(cookies_path, 'r') as f:
-                cookie_data = json.load(f)
-                self.cookies = cookie_data.get('cookies', {})
+            # Reload cookies and the profile of the browser that obtained them
+            self._load_cookies()
+            self.metrics.emit('cloudflare.clearance_refreshed', profile=self.fingerprint.id)
 
         except Exception as e:
             print(f"\033[93mWarning: Failed to refresh cookies: {e}\033[0m", file=sys.stderr)
 
-    def _make_request(self, method: str, endpoint: str, json_data: Dict[str, Any], pow_required: bool = False) -> Any:
-        url = f"{self.BASE_URL}{endpoint}"
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """Parse a Retry-After header given either in seconds or as an HTTP date"""
+        value = response.headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
 
-        retry_count = 0
-        max_retries = 2
+    def _check_cloudflare(self, text: str) -> None:
+        """Raise CloudflareError if the response is a challenge page, i.e. the clearance was rejected"""
+        if "<!DOCTYPE html>" in text and "Just a moment" in text:
+            print("\033[93mWarning: Cloudflare protection detected. Bypassing...\033[0m", file=sys.stderr)
+            self.metrics.emit('cloudflare.clearance_rejected', profile=self.fingerprint.id)
+            raise CloudflareError("Cloudflare protection detected")
+
+    def _raise_for_status(self, response, error_text: str) -> None:
+        if response.status_code == 401:
+            raise AuthenticationError("Invalid or expired authentication token")
+        elif response.status_code == 429:
+            raise RateLimitError("API rate limit exceeded", retry_after=self._retry_after(response))
+        elif response.status_code >= 500:
+            raise APIError(f"Server error occurred: {error_text}", response.status_code,
+                           retry_after=self._retry_after(response))
+        elif response.status_code != 200:
+            raise APIError(f"API request failed: {error_text}", response.status_code)
+
+    def _with_retries(self, endpoint: str, func: Callable[[], T]) -> T:
+        """Run func under the retry policy and circuit breaker"""
+        if getattr(self._retry_scope, 'active', False):
+            # Nested call (e.g. the PoW challenge for a completion): let the
+            # outermost attempt own retries and breaker accounting
+            return func()
+
+        self._retry_scope.active = True
+        try:
+            return self._retry_loop(endpoint, func)
+        finally:
+            self._retry_scope.active = False
+
+    def _retry_loop(self, endpoint: str, func: Callable[[], T]) -> T:
+        attempt = 0
 
-        while retry_count < max_retries:
+        while True:
+            self.circuit_breaker.before_call()
+            try:
+                result = func()
+            except DeepSeekError as e:
+                if not self.retry_policy.is_retryable(e):
+                    # Upstream answered, it just did not like the request
+                    self.circuit_breaker.record_success()
+                    raise
+
+                self.circuit_breaker.record_failure()
+                if attempt + 1 >= self.retry_policy.max_attempts:
+                    if isinstance(e, CloudflareError):
+                        raise CloudflareError("Failed to bypass Cloudflare protection after multiple attempts") from e
+                    raise
+
+                # The next attempt would only be shed, so report what upstream said
+                if self.circuit_breaker.state == CircuitBreaker.OPEN:
+                    raise
+
+                # Waits longer than max_delay would block inside the call; let the caller decide
+                retry_after = getattr(e, 'retry_after', None)
+                if not self.retry_policy.waits_for(retry_after):
+                    raise
+
+                if isinstance(e, CloudflareError):
+                    self._refresh_cookies()
+
+                delay = self.retry_policy.next_delay(attempt, retry_after)
+                self.metrics.emit('retry', endpoint=endpoint, reason=type(e).__name__)
+                self.metrics.emit('retry.delay_seconds', delay, endpoint=endpoint)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.circuit_breaker.release()
+                raise
+
+            self.circuit_breaker.record_success()
+            return result
+
+    def _make_request(self,
+                      method: str,
+                      endpoint: str,
+                      json_data: Optional[Dict[str, Any]],
+                      pow_required: bool = False,
+                      params: Optional[Dict[str, Any]] = None) -> Any:
+        # The query stays out of `endpoint`, which tags metrics and retries
+        url = f"{self.BASE_URL}{endpoint}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        requests = curl_requests()
+
+        def attempt() -> Any:
             try:
                 headers = self._get_headers()
                 if pow_required:
@@ -121,34 +296,19 @@ class DeepSeekAPI:
                     pow_response = self.pow_solver.solve_challenge(challenge)
                     headers = self._get_headers(pow_response)
 
-                response = requests.request(
-                    method=method,
-                    url=url,
+                response = self.transport.request(
+                    method,
+                    url,
                     headers=headers,
                     json=json_data,
                     cookies=self.cookies,
-                    impersonate='chrome120',
+                    impersonate=self.fingerprint.impersonate,
                     timeout=None
                 )
 
-                # Check if we hit Cloudflare protection
-                if "<!DOCTYPE html>" in response.text and "Just a moment" in response.text:
-                    print("\033[93mWarning: Cloudflare protection detected. Bypassing...\033[0m", file=sys.stderr)
-                    if retry_count < max_retries - 1:
-                        self._refresh_cookies()  # Refresh cookies
-                        retry_count += 1
-                        continue
-
-                # Handle other response codes
-                if response.status_code == 401:
-                    raise AuthenticationError("Invalid or expired authentication token")
-                elif response.status_code == 429:
-                    raise RateLimitError("API rate limit exceeded")
-                elif response.status_code >= 500:
-                    raise APIError(f"Server error occurred: {response.text}", response.status_code)
-                elif response.status_code != 200:
-                    raise APIError(f"API request failed: {response.text}", response.status_code)
+                self._check_cloudflare(response.text)
 
+                self._raise_for_status(response, response.text)
                 return response.json()
 
             except requests.exceptions.RequestException as e:
@@ -156,14 +316,14 @@ class DeepSeekAPI:
             except json.JSONDecodeError:
                 raise APIError("Invalid JSON response from server")
 
-        raise APIError("Failed to bypass Cloudflare protection after multiple attempts")
+        return self._with_retries(endpoint, attempt)
 
-    def _get_pow_challenge(self) -> Dict[str, Any]:
+    def _get_pow_challenge(self, target_path: str = '/api/v0/chat/completion') -> Dict[str, Any]:
         try:
             response = self._make_request(
                 'POST',
                 '/chat/create_pow_challenge',
-                {'target_path': '/api/v0/chat/completion'}
+                {'target_path': target_path}
             )
             return response['data']['biz_data']['challenge']
         except KeyError:
@@ -181,12 +341,124 @@ class DeepSeekAPI:
         except KeyError:
             raise APIError("Invalid session creation response format from server")
 
+    def upload_file(self,
+                    path: Union[str, Path],
+                    wait: bool = True,
+                    poll_interval: float = 1.0,
+                    timeout: float = 300.0,
+                    force: bool = False) -> str:
+        """
+        Upload a file for use in `chat_completion(ref_file_ids=...)` and return its ID
+
+        The file is streamed from disk by libcurl rather than read into memory.
+        Files whose content was already uploaded from this account are not sent
+        again; their ID is looked up in `upload_index` by SHA-256. Only files
+        the server has finished processing are indexed, so with `wait=False`
+        the upload isn't deduplicated later.
+
+        Args:
+            path (Union[str, Path]): File to upload
+            wait (bool): Wait until the server has finished processing the file and index it
+            poll_interval (float): Seconds between processing status checks
+            timeout (float): Seconds to wait for processing before giving up
+            force (bool): Upload even if the content is already in the index
+
+        Returns:
+            str: The file ID
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            APIError: If the upload is rejected or processing fails
+        """
+        path = Path(path).expanduser()
+        size = path.stat().st_size
+        digest = file_digest(path)
+        account = account_key(self.auth_token)
+
+        if not force:
+            file_id = self.upload_index.get(account, digest)
+            if file_id:
+                self.metrics.emit('upload.deduplicated')
+                return file_id
+
+        requests = curl_requests()
+        from curl_cffi import CurlMime
+
+        def attempt() -> Any:
+            headers = self._get_headers(
+                pow_response=self.pow_solver.solve_challenge(
+                    self._get_pow_challenge('/api/v0/file/upload_file')
+                )
+            )
+            # libcurl sets the multipart content type and boundary itself
+            del headers['content-type']
+
+            multipart = CurlMime()
+            multipart.addpart(
+                'file',
+                content_type=mimetypes.guess_type(path.name)[0] or 'application/octet-stream',
+                filename=path.name,
+                local_path=str(path)
+            )
+            try:
+                response = self.transport.request(
+                    'POST',
+                    f"{self.BASE_URL}/file/upload_file",
+                    headers=headers,
+                    multipart=multipart,
+                    cookies=self.cookies,
+                    impersonate=self.fingerprint.impersonate,
+                    timeout=None
+                )
+                self._check_cloudflare(response.text)
+                self._raise_for_status(response, response.text)
+                return response.json()
+            except requests.exceptions.RequestException as e:
+                raise NetworkError(f"Network error occurred during upload: {str(e)}")
+            except json.JSONDecodeError:
+                raise APIError("Invalid JSON response from server")
+            finally:
+                multipart.close()
+
+        response = self._with_retries('/file/upload_file', attempt)
+        try:
+            file_id = response['data']['biz_data']['id']
+        except (KeyError, TypeError):
+            raise APIError(f"Invalid upload response format from server: {response}")
+
+        self.metrics.emit('upload.bytes', size)
+        if wait:
+            self.wait_for_file(file_id, poll_interval, timeout)
+            self.upload_index.put(account, digest, file_id, path.name, size)
+        return file_id
+
+    def wait_for_file(self, file_id: str, poll_interval: float = 1.0, timeout: float = 300.0) -> Dict[str, Any]:
+        """Poll an uploaded file until the server has processed it and return its metadata"""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            response = self._make_request('GET', '/file/fetch_files', None, params={'file_ids': file_id})
+            try:
+                file_info = response['data']['biz_data']['files'][0]
+            except (KeyError, IndexError, TypeError):
+                raise APIError("Invalid file status response format from server")
+
+            status = file_info.get('status')
+            if status == 'SUCCESS':
+                return file_info
+            if status not in ('PENDING', 'PARSING'):
+                raise APIError(f"File {file_id} could not be processed: {status}")
+            if time.monotonic() >= deadline:
+                raise APIError(f"Timed out waiting for file {file_id} to be processed")
+            time.sleep(poll_interval)
+
     def chat_completion(self,
                     chat_session_id: str,
                     prompt: str,
                     parent_message_id: Optional[str] = None,
                     thinking_enabled: bool = True,
-                    search_enabled: bool = False) -> Generator[Dict[str, Any], None, None]:
+                    search_enabled: bool = False,
+                    ref_file_ids: Optional[List[str]] = None) -> Generator[Dict[str, Any], None, None]:
         """
         Send a message and get streaming response
 
@@ -196,15 +468,24 @@ class DeepSeekAPI:
             parent_message_id (Optional[str]): ID of the parent message for threading
             thinking_enabled (bool): Whether to show the thinking process
             search_enabled (bool): Whether to enable web search for up-to-date information
+            ref_file_ids (Optional[List[str]]): IDs of files from `upload_file` to attach
 
         Returns:
             Generator[Dict[str, Any], None, None]: Yields message chunks with content and type
 
         Raises:
             AuthenticationError: If the authentication token is invalid
-            RateLimitError: If the API rate limit is exceeded
+            RateLimitError: If the API rate limit is exceeded after all retries
             NetworkError: If a network error occurs
+            CircuitOpenError: If the circuit breaker is shedding requests
             APIError: If any other API error occurs
+
+        Failures before the first chunk is yielded are retried according to
+        `retry_policy`; once streaming has started errors are raised as-is.
+
+        With a `cache` configured, a repeated request is answered from the cache
+        with the same chunk stream and nothing is sent upstream, so the chat
+        session is not advanced.
         """
         if not prompt or not isinstance(prompt, str):
             raise ValueError("Prompt must be a non-empty string")
@@ -215,38 +496,83 @@ class DeepSeekAPI:
             'chat_session_id': chat_session_id,
             'parent_message_id': parent_message_id,
             'prompt': prompt,
-            'ref_file_ids': [],
+            'ref_file_ids': list(ref_file_ids or []),
             'thinking_enabled': thinking_enabled,
             'search_enabled': search_enabled,
         }
 
-        try:
-            headers = self._get_headers(
-                pow_response=self.pow_solver.solve_challenge(
-                    self._get_pow_challenge()
+        if self.cache is None or not self.cache.should_cache(search_enabled):
+            yield from self._stream_completion(json_data)
+            return
+
+        cache_key = self.cache.key(prompt, thinking_enabled, search_enabled, parent_message_id, ref_file_ids,
+                                   account=account_key(self.auth_token))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.metrics.emit('cache.hit')
+            for chunk in cached:
+                yield dict(chunk)
+            return
+
+        self.metrics.emit('cache.miss')
+        recorded = []
+        for chunk in self._stream_completion(json_data):
+            recorded.append(chunk)
+            yield chunk
+
+        # Only complete answers are worth replaying
+        if recorded and recorded[-1].get('finish_reason') == 'stop':
+            self.cache.put(cache_key, [dict(chunk) for chunk in recorded])
+
+    def _stream_completion(self, json_data: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+        requests = curl_requests()
+
+        def open_stream():
+            """Open the stream and read up to the first chunk, so failures before
+            any token reaches the caller can be retried"""
+            try:
+                headers = self._get_headers(
+                    pow_response=self.pow_solver.solve_challenge(
+                        self._get_pow_challenge()
+                    )
                 )
-            )
 
-            response = requests.post(
-                f"{self.BASE_URL}/chat/completion",
-                headers=headers,
-                json=json_data,
-                cookies=self.cookies,  # Add cookies
-                impersonate='chrome120',
-                stream=True,
-                timeout=None
-            )
+                response = self.transport.request(
+                    'POST',
+                    f"{self.BASE_URL}/chat/completion",
+                    headers=headers,
+                    json=json_data,
+                    cookies=self.cookies,  # Add cookies
+                    impersonate=self.fingerprint.impersonate,
+                    stream=True,
+                    timeout=None
+                )
 
-            if response.status_code != 200:
-                error_text = next(response.iter_lines(), b'').decode('utf-8', 'ignore')
-                if response.status_code == 401:
-                    raise AuthenticationError("Invalid or expired authentication token")
-                elif response.status_code == 429:
-                    raise RateLimitError("API rate limit exceeded")
-                else:
-                    raise APIError(f"API request failed: {error_text}", response.status_code)
+                if response.status_code != 200:
+                    error_text = b'\n'.join(response.iter_lines()).decode('utf-8', 'ignore')
+                    self._check_cloudflare(error_text)
+                    self._raise_for_status(response, error_text)
+
+                lines = response.iter_lines()
+                for chunk in lines:
+                    parsed = self._parse_chunk(chunk)
+                    if parsed:
+                        return lines, parsed
+                return lines, None
+
+            except requests.exceptions.RequestException as e:
+                raise NetworkError(f"Network error occurred during streaming: {str(e)}")
+
+        lines, parsed = self._with_retries('/chat/completion', open_stream)
+        if parsed is None:
+            return
+
+        try:
+            yield parsed
+            if parsed.get('finish_reason') == 'stop':
+                return
 
-            for chunk in response.iter_lines():
+            for chunk in lines:
                 try:
                     parsed = self._parse_chunk(chunk)
                     if parsed:
@@ -273,11 +599,15 @@ class DeepSeekAPI:
                     if 'delta' in choice:
                         delta = choice['delta']
 
-                        return {
+                        parsed = {
                             'content': delta.get('content', ''),
                             'type': delta.get('type', ''),
                             'finish_reason': choice.get('finish_reason')
                         }
+                        # Sources of a search-enabled answer, see dsk.aggregate
+                        if delta.get('search_results'):
+                            parsed['search_results'] = delta['search_results']
+                        return parsed
         except json.JSONDecodeError:
             raise APIError("Invalid JSON in response chunk")
         except Exception as e:
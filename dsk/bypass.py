@@ -6,6 +6,12 @@ import time
 import requests
 import json
 
+try:
+    from .fingerprint import FingerprintProfile
+except ImportError:
+    # Run as a plain script from inside dsk/
+    from fingerprint import FingerprintProfile
+
 def validate_cookies(cookies_data):
     """Validate that cf_clearance cookie is present and not empty"""
     cookies = cookies_data.get('cookies', {})
@@ -23,9 +29,12 @@ def get_and_save_cookies(server_url, cookie_file_path, max_retries=3):
                 time.sleep(5)
                 continue
 
+            user_agent = cookies_data.get('user_agent', '')
             cookies_to_save = {
                 'cookies': cookies_data.get('cookies', {}),
-                'user_agent': cookies_data.get('user_agent', '')
+                'user_agent': user_agent,
+                # Headers and TLS target the clearance must be presented with
+                'fingerprint': FingerprintProfile.from_user_agent(user_agent).to_dict() if user_agent else None
             }
 
             os.makedirs(os.path.dirname(cookie_file_path), exist_ok=True)
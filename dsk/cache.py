@@ -0,0 +1,187 @@
+"""
+Completion response cache
+
+Caches finished chat_completion streams keyed by account, prompt, flags and
+optional parent context, so re-runs and evaluation sweeps don't pay for a
+session, a PoW solve and a full generation each time. Entries live in an
+in-memory LRU tier and, if a path is given, in a zlib-compressed SQLite file
+shared across processes. Both tiers expire entries after `ttl` seconds and
+evict least recently used entries above their size limits.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Chunk = Dict[str, Any]
+
+# Memory hits refresh the disk tier's LRU order at most this often per entry
+TOUCH_INTERVAL = 60.0
+
+class ResponseCache:
+    def __init__(self,
+                 path: Optional[Union[str, Path]] = None,
+                 max_memory_entries: int = 256,
+                 max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_disk_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = 24 * 60 * 60,
+                 cache_search: bool = False):
+        """
+        Args:
+            path: SQLite file for the disk tier; memory only if None
+            max_memory_entries: Number of entries in the in-memory LRU tier
+            max_memory_bytes: Encoded JSON size above which the memory tier evicts
+            max_disk_bytes: Compressed size above which the disk tier evicts
+            ttl: Seconds an entry stays valid, None for no expiry
+            cache_search: Also cache search-enabled requests, whose answers go stale
+        """
+        self.max_memory_entries = max_memory_entries
+        self.max_memory_bytes   = max_memory_bytes
+        self.max_disk_bytes     = max_disk_bytes
+        self.ttl                = ttl
+        self.cache_search       = cache_search
+
+        self._lock   = threading.Lock()
+        # key -> (created, last disk touch, encoded size, chunks)
+        self._memory: "OrderedDict[str, Tuple[float, float, int, List[Chunk]]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._db     = None
+
+        if path is not None:
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " data BLOB NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def should_cache(self, search_enabled: bool) -> bool:
+        return self.cache_search or not search_enabled
+
+    @staticmethod
+    def key(prompt: str,
+            thinking_enabled: bool,
+            search_enabled: bool,
+            context: Optional[str] = None,
+            ref_file_ids: Optional[List[str]] = None,
+            account: Optional[str] = None) -> str:
+        """Cache key for a request
+
+        `context` identifies the conversation it continues and `account` the
+        account it is sent from (see uploads.account_key), whose file IDs and
+        history other accounts can't see.
+        """
+        material = json.dumps([account, prompt, thinking_enabled, search_enabled, context,
+                               sorted(ref_file_ids or [])], ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key: str) -> Optional[List[Chunk]]:
+        """Return the cached chunks for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, touched, size, chunks = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    # Keeps entries hot in memory from being evicted first on disk
+                    if self._db is not None and now - touched >= TOUCH_INTERVAL:
+                        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self._memory[key] = (created, now, size, chunks)
+                    return chunks
+                self._forget(key)
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute("SELECT created, data FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            created, data = row
+            if self._expired(created, now):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            encoded = zlib.decompress(data)
+            chunks = json.loads(encoded)
+            self._remember(key, created, now, len(encoded), chunks)
+            return chunks
+
+    def put(self, key: str, chunks: List[Chunk]) -> None:
+        now = time.time()
+        encoded = json.dumps(chunks, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with self._lock:
+            self._remember(key, now, now, len(encoded), chunks)
+
+            if self._db is None:
+                return
+
+            data = zlib.compress(encoded)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, created, accessed, size, data) VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(data), data)
+            )
+            self._evict_disk(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.execute("VACUUM")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, created: float, touched: float, size: int, chunks: List[Chunk]) -> None:
+        self._forget(key)
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = (created, touched, size, chunks)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_memory_entries or self._memory_bytes > self.max_memory_bytes:
+            _, (_, _, evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def _forget(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
+
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        excess = total - self.max_disk_bytes
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
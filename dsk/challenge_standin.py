@@ -0,0 +1,204 @@
+"""
+Local stand-in for the Cloudflare "Just a moment..." interstitial
+
+Serves a page shaped like the managed challenge that CloudflareBypasser has to
+get through: a hidden `cf-turnstile-response` input whose parent hosts a
+closed shadow root with the widget iframe, and inside the iframe a checkbox
+input in the body's shadow root. Clicking the checkbox sets a `cf_clearance`
+cookie and reloads the page, which then serves ordinary content. Everything
+is local and deterministic, so the bypass tier (server.py, bypass_cloudflare
+and CloudflareBypasser) can be benchmarked and profiled without live
+Cloudflare.
+
+Usage:
+    python -m dsk.challenge_standin --port 8081 --widget-delay 1.0
+
+Point the bypass server at it with ALLOW_LOCAL_URLS=true, e.g.
+    /cookies?url=http://127.0.0.1:8081/
+"""
+
+import argparse
+import json
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+CHALLENGE_PAGE = """<!DOCTYPE html>
+<html lang="en-US">
+<head>
+<meta charset="UTF-8">
+<title>Just a moment...</title>
+</head>
+<body>
+<div class="main-wrapper" role="main">
+  <div class="main-content">
+    <h1 class="zone-name-title">chat.deepseek.com</h1>
+    <h2 class="h2">Verifying you are human. This may take a few seconds.</h2>
+    <div id="turnstile-wrapper">
+      <div><input type="hidden" name="cf-turnstile-response" id="cf-chl-widget_response"></div>
+    </div>
+    <p>chat.deepseek.com needs to review the security of your connection before proceeding.</p>
+  </div>
+</div>
+<script>
+setTimeout(function () {
+  var host = document.getElementById('cf-chl-widget_response').parentElement;
+  var root = host.attachShadow({mode: 'closed'});
+  var iframe = document.createElement('iframe');
+  iframe.style.cssText = 'width:300px;height:65px;border:none';
+  iframe.srcdoc = %(widget)s;
+  root.appendChild(iframe);
+}, %(widget_delay_ms)d);
+</script>
+</body>
+</html>
+"""
+
+# The iframe is same-origin (srcdoc) so the click can reach the verify endpoint
+WIDGET_PAGE = """<!DOCTYPE html>
+<html>
+<body>
+<script>
+var root = document.body.attachShadow({mode: 'closed'});
+root.innerHTML = '<label><input type="checkbox"><span>Verify you are human</span></label>';
+root.querySelector('input').addEventListener('click', function () {
+  fetch('/__verify', {method: 'POST', credentials: 'same-origin'}).then(function () {
+    window.top.location.reload();
+  });
+});
+</script>
+</body>
+</html>
+"""
+
+CONTENT_PAGE = """<!DOCTYPE html>
+<html lang="en-US">
+<head>
+<meta charset="UTF-8">
+<title>DeepSeek</title>
+</head>
+<body>
+<div id="root">
+  <p>Challenge stand-in: the clearance was accepted and this is the page behind it.</p>
+</div>
+</body>
+</html>
+"""
+
+class ChallengeStandin:
+    """Issues and checks clearances and counts what happened, for load tests"""
+
+    def __init__(self, widget_delay: float = 1.0, verify_delay: float = 0.0, clearance_ttl: float = 1800):
+        """
+        Args:
+            widget_delay: Seconds before the checkbox is rendered, like Turnstile's own checks
+            verify_delay: Seconds the verify endpoint takes before issuing the cookie
+            clearance_ttl: Seconds an issued cf_clearance stays valid
+        """
+        self.widget_delay  = widget_delay
+        self.verify_delay  = verify_delay
+        self.clearance_ttl = clearance_ttl
+
+        self._lock       = threading.Lock()
+        self._clearances: Dict[str, float] = {}
+        self.stats       = {'challenges': 0, 'clearances': 0, 'passed': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def issue(self) -> str:
+        if self.verify_delay:
+            time.sleep(self.verify_delay)
+        token = f"{secrets.token_urlsafe(32)}-{int(time.time())}-1.2.1.1"
+        with self._lock:
+            self._clearances[token] = time.time() + self.clearance_ttl
+            self.stats['clearances'] += 1
+        return token
+
+    def is_cleared(self, token: Optional[str]) -> bool:
+        with self._lock:
+            expires = self._clearances.get(token or '')
+            return expires is not None and expires > time.time()
+
+    def challenge_page(self) -> str:
+        return CHALLENGE_PAGE % {
+            # Escaped so the widget's own </script> doesn't end the outer script
+            'widget': json.dumps(WIDGET_PAGE).replace('</', '<\\/'),
+            'widget_delay_ms': int(self.widget_delay * 1000),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+def _make_handler(standin: ChallengeStandin):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: str, content_type: str = 'text/html; charset=UTF-8',
+                  headers: Tuple[Tuple[str, str], ...] = ()) -> None:
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Cache-Control', 'no-store')
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _clearance(self) -> Optional[str]:
+            cookie = SimpleCookie(self.headers.get('Cookie', ''))
+            return cookie['cf_clearance'].value if 'cf_clearance' in cookie else None
+
+        def do_GET(self) -> None:
+            if self.path == '/__stats':
+                self._send(200, json.dumps(standin.snapshot()), 'application/json')
+            elif standin.is_cleared(self._clearance()):
+                standin._count('passed')
+                self._send(200, CONTENT_PAGE)
+            else:
+                standin._count('challenges')
+                self._send(403, standin.challenge_page(), headers=(('cf-mitigated', 'challenge'),))
+
+        def do_POST(self) -> None:
+            if self.path != '/__verify':
+                self._send(405, '')
+                return
+            token = standin.issue()
+            self._send(204, '', headers=(
+                ('Set-Cookie', f'cf_clearance={token}; Path=/; Max-Age={int(standin.clearance_ttl)}; HttpOnly'),
+            ))
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+def serve(standin: ChallengeStandin, host: str = '127.0.0.1', port: int = 8081) -> ThreadingHTTPServer:
+    """Create the HTTP server; call serve_forever() on it, e.g. in a thread"""
+    server = ThreadingHTTPServer((host, port), _make_handler(standin))
+    server.daemon_threads = True
+    return server
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Cloudflare challenge stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--widget-delay", type=float, default=1.0, help="Seconds before the checkbox appears")
+    parser.add_argument("--verify-delay", type=float, default=0.0, help="Seconds to issue a clearance")
+    args = parser.parse_args()
+
+    server = serve(ChallengeStandin(args.widget_delay, args.verify_delay), args.host, args.port)
+    print(f"Challenge stand-in on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Browser fingerprint profiles
+
+Cloudflare ties a cf_clearance cookie to the browser that earned it. Requests
+that present the cookie with a different User-Agent, mismatching client hints
+or a TLS fingerprint from another Chrome version get challenged again. A
+FingerprintProfile captures everything the client has to present consistently:
+the browser's User-Agent, the matching sec-ch-ua client hints, the closest
+curl_cffi impersonation target and the web app version. It is saved next to
+the cookies in cookies.json and applied to every request.
+"""
+
+import hashlib
+import re
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict
+
+# Chrome versions curl_cffi can impersonate, newest last
+IMPERSONATE_TARGETS = {
+    99: 'chrome99',
+    100: 'chrome100',
+    101: 'chrome101',
+    104: 'chrome104',
+    107: 'chrome107',
+    110: 'chrome110',
+    116: 'chrome116',
+    119: 'chrome119',
+    120: 'chrome120',
+    123: 'chrome123',
+    124: 'chrome124',
+    131: 'chrome131',
+}
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+DEFAULT_APP_VERSION = '20241129.1'
+DEFAULT_ACCEPT_LANGUAGE = 'en,fr-FR;q=0.9,fr;q=0.8,es-ES;q=0.7,es;q=0.6,en-US;q=0.5,am;q=0.4,de;q=0.3'
+
+def _impersonate_target(major: int) -> str:
+    """Newest impersonation target not newer than the browser"""
+    candidates = [version for version in IMPERSONATE_TARGETS if version <= major]
+    return IMPERSONATE_TARGETS[max(candidates) if candidates else min(IMPERSONATE_TARGETS)]
+
+def _brand_list(brand: str, major: int) -> str:
+    """sec-ch-ua value as Chromium generates it, including its GREASE brand"""
+    greasey_chars = [' ', '(', ':', '-', '.', '/', ')', ';', '=', '?', '_']
+    greased_versions = ['8', '99', '24']
+    orders = [[0, 1, 2], [0, 2, 1], [1, 0, 2], [1, 2, 0], [2, 0, 1], [2, 1, 0]]
+
+    greased = (f'Not{greasey_chars[major % 11]}A{greasey_chars[(major + 1) % 11]}Brand',
+               greased_versions[major % 3])
+    entries = [greased, ('Chromium', str(major)), (brand, str(major))]
+
+    ordered = [None] * 3
+    for entry, position in zip(entries, orders[major % 6]):
+        ordered[position] = entry
+    return ', '.join(f'"{name}";v="{version}"' for name, version in ordered)
+
+def _platform(user_agent: str) -> str:
+    if 'Android' in user_agent:
+        return 'Android'
+    if 'Windows' in user_agent:
+        return 'Windows'
+    if 'Macintosh' in user_agent or 'Mac OS X' in user_agent:
+        return 'macOS'
+    if 'CrOS' in user_agent:
+        return 'Chrome OS'
+    return 'Linux'
+
+@dataclass(frozen=True)
+class FingerprintProfile:
+    user_agent: str
+    impersonate: str
+    sec_ch_ua: str
+    sec_ch_ua_mobile: str = '?0'
+    sec_ch_ua_platform: str = '"Windows"'
+    app_version: str = DEFAULT_APP_VERSION
+    accept_language: str = DEFAULT_ACCEPT_LANGUAGE
+
+    @classmethod
+    def from_user_agent(cls, user_agent: str, app_version: str = DEFAULT_APP_VERSION) -> 'FingerprintProfile':
+        """Derive a consistent profile from the User-Agent of the browser that got the clearance"""
+        match = re.search(r'(?:Chrome|Chromium|HeadlessChrome)/(\d+)', user_agent)
+        major = int(match.group(1)) if match else 120
+        brand = 'Microsoft Edge' if 'Edg/' in user_agent else 'Google Chrome'
+        mobile = 'Android' in user_agent
+
+        return cls(
+            user_agent=user_agent,
+            impersonate=_impersonate_target(major) + ('_android' if mobile and major >= 131 else ''),
+            sec_ch_ua=_brand_list(brand, major),
+            sec_ch_ua_mobile='?1' if mobile else '?0',
+            sec_ch_ua_platform=f'"{_platform(user_agent)}"',
+            app_version=app_version,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FingerprintProfile':
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @property
+    def id(self) -> str:
+        """Short stable identifier, used to tag metrics"""
+        material = f'{self.impersonate}|{self.user_agent}'
+        return f'{self.impersonate}-{hashlib.sha256(material.encode()).hexdigest()[:8]}'
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            'accept-language': self.accept_language,
+            'sec-ch-ua': self.sec_ch_ua,
+            'sec-ch-ua-mobile': self.sec_ch_ua_mobile,
+            'sec-ch-ua-platform': self.sec_ch_ua_platform,
+            'user-agent': self.user_agent,
+            'x-app-version': self.app_version,
+        }
+
+DEFAULT_PROFILE = FingerprintProfile.from_user_agent(DEFAULT_USER_AGENT)
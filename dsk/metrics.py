@@ -0,0 +1,66 @@
+"""
+In-process metrics for the DeepSeek client.
+
+Counters and gauges are kept in memory and can be read back with `snapshot()`.
+Listeners registered with `subscribe()` receive every event as it happens, which
+is the hook for forwarding them to statsd, Prometheus or plain logging.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+MetricKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+Listener = Callable[[str, float, Dict[str, Any]], None]
+
+class Metrics:
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self._counters  = defaultdict(float)
+        self._gauges    = {}
+        self._listeners: List[Listener] = []
+
+    @staticmethod
+    def _key(name: str, tags: Dict[str, Any]) -> MetricKey:
+        return name, tuple(sorted(tags.items()))
+
+    def subscribe(self, listener: Listener) -> None:
+        """Register a callback invoked as listener(name, value, tags) for every event"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def emit(self, name: str, value: float = 1, **tags: Any) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self._counters[self._key(name, tags)] += value
+            listeners = list(self._listeners)
+        self._notify(listeners, name, value, tags)
+
+    def gauge(self, name: str, value: float, **tags: Any) -> None:
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges[self._key(name, tags)] = value
+            listeners = list(self._listeners)
+        self._notify(listeners, name, value, tags)
+
+    def get(self, name: str, **tags: Any) -> float:
+        """Return the current value of a counter or gauge"""
+        key = self._key(name, tags)
+        with self._lock:
+            if key in self._gauges:
+                return self._gauges[key]
+            return self._counters.get(key, 0)
+
+    def snapshot(self) -> Dict[MetricKey, float]:
+        """Return a copy of every counter and gauge"""
+        with self._lock:
+            return {**self._counters, **self._gauges}
+
+    @staticmethod
+    def _notify(listeners: List[Listener], name: str, value: float, tags: Dict[str, Any]) -> None:
+        for listener in listeners:
+            try:
+                listener(name, value, tags)
+            except Exception:
+                # A broken exporter must never break a request
+                pass
@@ -10,9 +10,9 @@ required for authentication or rate limiting purposes.
 
 import json
 import base64
-import wasmtime
-import numpy as np
-from typing import Dict, Any
+import struct
+import threading
+from typing import Dict, Any, Optional, Tuple
 import os
 
 WASM_PATH = f'{os.path.dirname(__file__)}/wasm/sha3_wasm_bg.7b9ca65ddd.wasm'
@@ -23,13 +23,23 @@ class DeepSeekHash:
         self.memory   = None
         self.store    = None
         
-    def init(self, wasm_path: str):
+    @staticmethod
+    def compile(wasm_path: str) -> Tuple[Any, Any]:
+        """Compile the module once; the (engine, module) pair can back many instances"""
+        import wasmtime
+        
         engine = wasmtime.Engine()
         
         with open(wasm_path, 'rb') as f:
             wasm_bytes = f.read()
             
-        module = wasmtime.Module(engine, wasm_bytes)
+        return engine, wasmtime.Module(engine, wasm_bytes)
+    
+    def init(self, wasm_path: str, engine: Optional[Any] = None, module: Optional[Any] = None):
+        import wasmtime
+        
+        if module is None:
+            engine, module = self.compile(wasm_path)
         
         self.store = wasmtime.Store(engine)
         linker     = wasmtime.Linker(engine)
@@ -51,6 +61,23 @@ class DeepSeekHash:
             
         return ptr, length
     
+    def hash(self, text: str) -> str:
+        """Returns the DeepSeekHashV1 hex digest of text as computed by the WASM module"""
+        retptr = self.instance.exports(self.store)["__wbindgen_add_to_stack_pointer"](self.store, -16)
+        
+        try:
+            ptr, length = self._write_to_memory(text)
+            self.instance.exports(self.store)["wasm_deepseek_hash_v1"](self.store, retptr, ptr, length)
+            
+            memory_view = self.memory.data_ptr(self.store)
+            out_ptr     = int.from_bytes(bytes(memory_view[retptr:retptr + 4]), byteorder='little')
+            out_len     = int.from_bytes(bytes(memory_view[retptr + 4:retptr + 8]), byteorder='little')
+            
+            return bytes(memory_view[out_ptr:out_ptr + out_len]).decode('utf-8')
+            
+        finally:
+            self.instance.exports(self.store)["__wbindgen_add_to_stack_pointer"](self.store, 16)
+    
     def calculate_hash(self, algorithm: str, challenge: str, salt: str, 
                       difficulty: int, expire_at: int) -> float:
         
@@ -78,7 +105,7 @@ class DeepSeekHash:
                 return None
             
             value_bytes = bytes(memory_view[retptr + 8:retptr + 16])
-            value       = np.frombuffer(value_bytes, dtype=np.float64)[0]
+            value       = struct.unpack('<d', value_bytes)[0]
             
             return int(value)
             
@@ -86,8 +113,50 @@ class DeepSeekHash:
             self.instance.exports(self.store)["__wbindgen_add_to_stack_pointer"](self.store, 16)
 
 class DeepSeekPOW:
-    def __init__(self):
-        self.hasher = DeepSeekHash().init(WASM_PATH)
+    BACKENDS = ('wasm', 'native')
+
+    def __init__(self, backend: str = 'wasm'):
+        """
+        Args:
+            backend (str): 'wasm' runs the original solver module, 'native' the
+                vectorized NumPy/hashlib implementation in dsk.pow_native
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown PoW backend {backend!r}, expected one of {self.BACKENDS}")
+        self.backend   = backend
+        self._hasher   = None
+        self._compiled = None
+        self._local    = threading.local()
+        self._lock     = threading.Lock()
+    
+    @property
+    def hasher(self):
+        """The backend's hasher for the calling thread, built on first use
+        
+        A WASM instance keeps its stack pointer and scratch buffers in its
+        store, which concurrent solves would corrupt, so every thread gets its
+        own instance of a module compiled once per solver. The native hasher
+        keeps no state between calls and is shared.
+        """
+        if self.backend == 'native':
+            if self._hasher is None:
+                with self._lock:
+                    if self._hasher is None:
+                        from .pow_native import NativeHash
+                        self._hasher = NativeHash()
+            return self._hasher
+        
+        hasher = getattr(self._local, 'hasher', None)
+        if hasher is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = DeepSeekHash.compile(WASM_PATH)
+            hasher = self._local.hasher = DeepSeekHash().init(WASM_PATH, *self._compiled)
+        return hasher
+    
+    def warmup(self) -> None:
+        """Compile the solver now instead of on the first challenge"""
+        self.hasher
     
     def solve_challenge(self, config: Dict[str, Any]) -> str:
         """Solves a proof-of-work challenge and returns the encoded response"""
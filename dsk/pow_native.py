@@ -0,0 +1,161 @@
+"""
+Native DeepSeek Proof of Work backend
+
+Implements the challenge algorithms without the WASM module. DeepSeekHashV1 is
+SHA3-256 with the first Keccak-f[1600] round skipped (rounds 1..23), so it
+can't go through hashlib; instead many candidate nonces are hashed at once
+with a Keccak permutation vectorized over NumPy uint64 lanes. Standard SHA3-256
+challenges go through hashlib.
+"""
+
+import hashlib
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+RATE = 136  # SHA3-256 rate in bytes
+
+ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+
+# Rotation offsets indexed by lane x + 5 * y
+ROTATIONS = [
+     0,  1, 62, 28, 27,
+    36, 44,  6, 55, 20,
+     3, 10, 43, 25, 39,
+    41, 45, 15, 21,  8,
+    18,  2, 61, 56, 14,
+]
+
+# Destination lane of each source lane in the pi step
+PI = [y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5)]
+
+# Neighbouring lanes combined with each lane in the chi step
+CHI = [((x + 1) % 5 + 5 * y, (x + 2) % 5 + 5 * y) for y in range(5) for x in range(5)]
+
+_RC  = [np.uint64(rc) for rc in ROUND_CONSTANTS]
+_ROT = [(np.uint64(r), np.uint64(64 - r)) for r in ROTATIONS]
+_ONE = np.uint64(1)
+_63  = np.uint64(63)
+
+def _rotl(lane: np.ndarray, left: np.uint64, right: np.uint64) -> np.ndarray:
+    return (lane << left) | (lane >> right)
+
+def keccak_f(state: List[np.ndarray], first_round: int = 0) -> List[np.ndarray]:
+    """Keccak-f[1600] on 25 lanes, each an array holding one lane of many states"""
+    for rnd in range(first_round, 24):
+        c = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ ((c[(x + 1) % 5] << _ONE) | (c[(x + 1) % 5] >> _63)) for x in range(5)]
+
+        b = [None] * 25
+        for i in range(25):
+            lane = state[i] ^ d[i % 5]
+            left, right = _ROT[i]
+            b[PI[i]] = _rotl(lane, left, right) if ROTATIONS[i] else lane
+
+        state = [b[i] ^ (~b[j] & b[k]) for i, (j, k) in enumerate(CHI)]
+        state[0] = state[0] ^ _RC[rnd]
+    return state
+
+def sha3_256_batch(messages: np.ndarray, first_round: int = 0) -> List[np.ndarray]:
+    """Hash equal-length messages given as an (n, length) uint8 array
+
+    Returns the four 64-bit lanes of the digests, each an array of n values.
+    """
+    count, length = messages.shape
+    blocks = length // RATE + 1
+
+    padded = np.zeros((count, blocks * RATE), dtype=np.uint8)
+    padded[:, :length] = messages
+    padded[:, length] ^= 0x06
+    padded[:, -1] ^= 0x80
+
+    lanes = padded.view('<u8').astype(np.uint64, copy=False)
+    state = [np.zeros(count, dtype=np.uint64) for _ in range(25)]
+    for block in range(blocks):
+        offset = block * (RATE // 8)
+        for i in range(RATE // 8):
+            state[i] = state[i] ^ lanes[:, offset + i]
+        state = keccak_f(state, first_round)
+
+    return state[:4]
+
+def _digest_lanes(hex_digest: str) -> List[np.uint64]:
+    raw = bytes.fromhex(hex_digest)
+    return [np.uint64(int.from_bytes(raw[i:i + 8], 'little')) for i in range(0, 32, 8)]
+
+def deepseek_hash_v1(data: bytes) -> str:
+    """Hex digest of DeepSeekHashV1 for a single message"""
+    message = np.frombuffer(data, dtype=np.uint8).reshape(1, -1)
+    lanes = sha3_256_batch(message, first_round=1)
+    return b''.join(int(lane[0]).to_bytes(8, 'little') for lane in lanes).hex()
+
+def _decimal_digits(nonces: np.ndarray, width: int) -> np.ndarray:
+    """ASCII digits of same-width nonces as an (n, width) uint8 array"""
+    digits = np.empty((len(nonces), width), dtype=np.uint8)
+    rest = nonces.copy()
+    for position in range(width - 1, -1, -1):
+        digits[:, position] = rest % 10 + 48
+        rest //= 10
+    return digits
+
+class NativeHash:
+    def __init__(self, batch_size: int = 8192):
+        self.batch_size = batch_size
+        self.solvers: Dict[str, Callable[[str, str, int], Optional[int]]] = {
+            'DeepSeekHashV1': self._solve_keccak,
+            'SHA3-256': self._solve_hashlib,
+        }
+
+    def init(self, wasm_path: Optional[str] = None):
+        # Nothing to compile; kept for interface parity with DeepSeekHash
+        return self
+
+    def calculate_hash(self, algorithm: str, challenge: str, salt: str,
+                       difficulty: int, expire_at: int) -> Optional[int]:
+        solver = self.solvers.get(algorithm)
+        if solver is None:
+            raise ValueError(f"Unsupported PoW algorithm: {algorithm}")
+        return solver(challenge, f"{salt}_{expire_at}_", int(difficulty))
+
+    def _solve_hashlib(self, challenge: str, prefix: str, difficulty: int) -> Optional[int]:
+        base = hashlib.sha3_256(prefix.encode())
+        for nonce in range(difficulty):
+            candidate = base.copy()
+            candidate.update(str(nonce).encode())
+            if candidate.hexdigest() == challenge:
+                return nonce
+        return None
+
+    def _solve_keccak(self, challenge: str, prefix: str, difficulty: int, first_round: int = 1) -> Optional[int]:
+        target = _digest_lanes(challenge)
+        prefix_bytes = np.frombuffer(prefix.encode(), dtype=np.uint8)
+
+        start = 0
+        while start < difficulty:
+            # Nonces in a batch must share a digit count so messages have equal length
+            width = len(str(start))
+            stop = min(difficulty, 10 ** width, start + self.batch_size)
+            nonces = np.arange(start, stop, dtype=np.uint64)
+
+            messages = np.empty((len(nonces), len(prefix_bytes) + width), dtype=np.uint8)
+            messages[:, :len(prefix_bytes)] = prefix_bytes
+            messages[:, len(prefix_bytes):] = _decimal_digits(nonces, width)
+
+            lanes = sha3_256_batch(messages, first_round)
+            match = lanes[0] == target[0]
+            if match.any():
+                for i in range(1, 4):
+                    match &= lanes[i] == target[i]
+                hits = np.flatnonzero(match)
+                if len(hits):
+                    return int(nonces[hits[0]])
+
+            start = stop
+        return None
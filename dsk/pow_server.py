@@ -0,0 +1,352 @@
+"""
+Shared DeepSeek Proof of Work solver service
+
+Runs a pool of warm DeepSeekPOW workers behind a Unix socket or a localhost TCP
+port, so that many lightweight clients can share one solving tier instead of
+each compiling the WASM module and burning CPU on their own.
+
+The wire protocol is newline-delimited JSON. Clients may pipeline any number of
+requests on one connection; responses come back as soon as they are solved and
+are matched to requests by `id`:
+
+    -> {"id": 1, "challenge": {...}}
+    <- {"id": 1, "result": "<base64 pow response>"}
+    <- {"id": 2, "error": "..."}
+    <- {"id": 3, "error": "...", "code": "unavailable"}
+
+Errors with code "unavailable" mean the solver pool itself failed, e.g. while
+the server shuts down or after a worker crashed, rather than the challenge;
+clients treat them like an unreachable server.
+
+Workers are spawned rather than forked, since a fork of a process that has
+already set up wasmtime can deadlock in the worker's initializer. Scripts
+that start a PowServer themselves therefore need the usual
+`if __name__ == '__main__':` guard.
+
+Usage:
+    python -m dsk.pow_server --unix /tmp/dsk-pow.sock --workers 4
+    python -m dsk.pow_server --host 127.0.0.1 --port 8765
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .pow import DeepSeekPOW
+
+Address = Union[str, Tuple[str, int]]
+
+class ServerUnavailable(ConnectionError):
+    """The PoW server answered, but its solver pool can't take work"""
+
+UNAVAILABLE = 'unavailable'
+
+_worker_solver: Optional[DeepSeekPOW] = None
+
+def _init_worker() -> None:
+    global _worker_solver
+    _worker_solver = DeepSeekPOW()
+    _worker_solver.warmup()
+
+def _solve(config: Dict[str, Any]) -> str:
+    return _worker_solver.solve_challenge(config)
+
+def parse_address(address: str) -> Address:
+    """Parse 'unix:/path', '/path' or 'host:port' into a socket address"""
+    if address.startswith('unix:'):
+        return address[len('unix:'):]
+    if address.startswith('/') or address.startswith('.'):
+        return address
+    host, _, port = address.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        write_lock = threading.Lock()
+        pending    = []
+
+        def reply(payload: Dict[str, Any]) -> None:
+            data = (json.dumps(payload) + '\n').encode()
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError, ValueError):
+                    pass
+
+        def on_done(request_id: Any, future: Future) -> None:
+            try:
+                reply({'id': request_id, 'result': future.result()})
+            except (BrokenProcessPool, CancelledError) as e:
+                reply({'id': request_id, 'error': f"{type(e).__name__}: {e}", 'code': UNAVAILABLE})
+            except Exception as e:
+                reply({'id': request_id, 'error': f"{type(e).__name__}: {e}"})
+
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+                request_id = message['id']
+                challenge = message['challenge']
+            except (ValueError, KeyError, TypeError) as e:
+                reply({'id': None, 'error': f"Malformed request: {e}"})
+                continue
+
+            try:
+                future = self.server.pow_server.submit(challenge)
+            except RuntimeError as e:
+                # Server is shutting down
+                reply({'id': request_id, 'error': str(e), 'code': UNAVAILABLE})
+                break
+            future.add_done_callback(lambda f, rid=request_id: on_done(rid, f))
+            pending.append(future)
+            pending = [f for f in pending if not f.done()]
+
+        # Client closed its side; finish what it already asked for
+        for future in pending:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class PowServer:
+    def __init__(self, address: Address, workers: Optional[int] = None):
+        self.address  = address
+        self.workers  = workers or os.cpu_count() or 1
+        self.executor = self._new_executor()
+        self._lock    = threading.Lock()
+        self._closed  = False
+
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self.server = _UnixServer(address, _Handler)
+        else:
+            self.server = _TCPServer(address, _Handler)
+        self.server.pow_server = self
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, challenge: Dict[str, Any]) -> Future:
+        """Queue a challenge on the pool, replacing the pool if a worker crash broke it"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PoW server is shutting down")
+            executor = self.executor
+        try:
+            return executor.submit(_solve, challenge)
+        except BrokenProcessPool:
+            return self._replace_executor(executor).submit(_solve, challenge)
+
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PoW server is shutting down")
+            # Requests that failed on the same broken pool only replace it once
+            if self.executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._new_executor()
+                print("\033[93mWarning: PoW worker pool broke, restarted it\033[0m", file=sys.stderr)
+            return self.executor
+
+    def warmup(self, timeout: float = 120.0) -> None:
+        """Start every worker process so the first requests don't pay for WASM compilation
+
+        Raises concurrent.futures.TimeoutError if the workers aren't up within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        futures = [self.executor.submit(time.sleep, 0) for _ in range(self.workers)]
+        for future in futures:
+            future.result(timeout=max(0.0, deadline - time.monotonic()))
+
+    def serve_forever(self) -> None:
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self.server.server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+class RemotePOW:
+    """Drop-in replacement for DeepSeekPOW that solves challenges on a PowServer
+
+    Requests from all threads are pipelined over one connection. If the server
+    can't be reached and `fallback` is set, challenges are solved locally and
+    the server is retried after `retry_interval` seconds.
+    """
+
+    def __init__(self,
+                 address: Union[str, Address],
+                 timeout: float = 30.0,
+                 fallback: bool = True,
+                 retry_interval: float = 5.0):
+        self.address        = parse_address(address) if isinstance(address, str) else address
+        self.timeout        = timeout
+        self.fallback       = fallback
+        self.retry_interval = retry_interval
+
+        self._lock       = threading.Lock()
+        self._sock       = None
+        self._pending    = {}
+        self._ids        = itertools.count(1)
+        self._down_until = 0.0
+        self._local      = None
+
+    def _connect(self) -> socket.socket:
+        if isinstance(self.address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        sock.settimeout(None)
+
+        reader = threading.Thread(target=self._read_loop, args=(sock,), daemon=True)
+        reader.start()
+        return sock
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        try:
+            for line in sock.makefile('rb'):
+                message = json.loads(line)
+                with self._lock:
+                    future = self._pending.pop(message.get('id'), None)
+                if future is None:
+                    continue
+                if message.get('code') == UNAVAILABLE:
+                    future.set_exception(ServerUnavailable(f"PoW server unavailable: {message['error']}"))
+                elif 'error' in message:
+                    future.set_exception(RuntimeError(f"PoW server error: {message['error']}"))
+                else:
+                    future.set_result(message['result'])
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._drop_connection(sock, ConnectionError("PoW server connection closed"))
+
+    def _drop_connection(self, sock: socket.socket, error: Exception) -> None:
+        with self._lock:
+            if self._sock is not sock:
+                return
+            self._sock = None
+            pending, self._pending = self._pending, {}
+        try:
+            sock.close()
+        except OSError:
+            pass
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _solve_remote(self, config: Dict[str, Any]) -> str:
+        future = Future()
+        with self._lock:
+            if self._sock is None:
+                self._sock = self._connect()
+            sock = self._sock
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                sock.sendall((json.dumps({'id': request_id, 'challenge': config}) + '\n').encode())
+                error = None
+            except OSError as e:
+                error = e
+
+        if error is not None:
+            # Fails every request pipelined on this connection, not just this one
+            self._drop_connection(sock, error)
+            raise error
+
+        try:
+            return future.result(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def warmup(self) -> None:
+        """Connect to the server now, or warm the local fallback if it is unreachable"""
+        try:
+            with self._lock:
+                if self._sock is None:
+                    self._sock = self._connect()
+        except OSError:
+            if not self.fallback:
+                raise
+            self._down_until = time.monotonic() + self.retry_interval
+            with self._lock:
+                if self._local is None:
+                    self._local = DeepSeekPOW()
+            self._local.warmup()
+
+    def _solve_local(self, config: Dict[str, Any]) -> str:
+        # One solver for all threads is safe: DeepSeekPOW gives each thread its own WASM instance
+        with self._lock:
+            if self._local is None:
+                self._local = DeepSeekPOW()
+            local = self._local
+        return local.solve_challenge(config)
+
+    def solve_challenge(self, config: Dict[str, Any]) -> str:
+        """Solves a proof-of-work challenge and returns the encoded response"""
+        if time.monotonic() >= self._down_until:
+            try:
+                return self._solve_remote(config)
+            except (OSError, TimeoutError, FutureTimeoutError, ConnectionError) as e:
+                if not self.fallback:
+                    raise
+                self._down_until = time.monotonic() + self.retry_interval
+                print(f"\033[93mWarning: PoW server unavailable ({str(e) or type(e).__name__}), solving locally\033[0m", file=sys.stderr)
+        return self._solve_local(config)
+
+    def close(self) -> None:
+        with self._lock:
+            sock = self._sock
+        if sock is not None:
+            self._drop_connection(sock, ConnectionError("RemotePOW closed"))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DeepSeek PoW solver service")
+    parser.add_argument("--unix", help="Unix socket path to listen on")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="Number of solver processes (default: CPU count)")
+    args = parser.parse_args()
+
+    address = args.unix if args.unix else (args.host, args.port)
+    server = PowServer(address, workers=args.workers)
+    server.warmup()
+    print(f"PoW server listening on {address} with {server.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
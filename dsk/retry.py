@@ -0,0 +1,147 @@
+"""
+Retry and load-shedding policies for the DeepSeek client.
+
+RetryPolicy decides whether a failed call is retried and how long to wait,
+using exponential backoff with full jitter so that many clients hitting the
+same outage do not retry in lockstep. CircuitBreaker stops sending requests
+while upstream keeps failing and lets a single trial request through once the
+recovery timeout has passed.
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+from .exceptions import (
+    DeepSeekError,
+    RateLimitError,
+    NetworkError,
+    CloudflareError,
+    CircuitOpenError,
+    APIError,
+)
+from .metrics import Metrics
+
+class RetryPolicy:
+    def __init__(self,
+                 max_attempts: int = 4,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 multiplier: float = 2.0,
+                 retry_statuses: tuple = (429, 500, 502, 503, 504),
+                 rng: Optional[random.Random] = None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts   = max_attempts
+        self.base_delay     = base_delay
+        self.max_delay      = max_delay
+        self.multiplier     = multiplier
+        self.retry_statuses = retry_statuses
+        self.rng            = rng or random.Random()
+
+    def is_retryable(self, error: DeepSeekError) -> bool:
+        """Whether the error is a transient upstream failure worth retrying"""
+        if isinstance(error, (RateLimitError, NetworkError, CloudflareError)):
+            return True
+        if isinstance(error, APIError):
+            return error.status_code in self.retry_statuses
+        return False
+
+    def waits_for(self, retry_after: Optional[float]) -> bool:
+        """Whether a server-requested wait fits within max_delay; longer ones are left to the caller"""
+        return retry_after is None or retry_after <= self.max_delay
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based), never more than max_delay"""
+        ceiling = min(self.max_delay, self.base_delay * (self.multiplier ** attempt))
+        delay   = self.rng.uniform(0, ceiling)
+
+        if retry_after is not None:
+            # Honour the server's hint, but still spread clients over a small window
+            delay = min(self.max_delay, retry_after + self.rng.uniform(0, self.base_delay))
+
+        return delay
+
+class NoRetryPolicy(RetryPolicy):
+    def __init__(self):
+        super().__init__(max_attempts=1)
+
+class CircuitBreaker:
+    CLOSED    = 'closed'
+    OPEN      = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 metrics: Optional[Metrics] = None,
+                 name: str = 'deepseek'):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout  = recovery_timeout
+        self.metrics           = metrics
+        self.name              = name
+
+        self._lock            = threading.Lock()
+        self._state           = self.CLOSED
+        self._failures        = 0
+        self._opened_at       = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call should be shed"""
+        with self._lock:
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    self._emit('circuit_breaker.rejected')
+                    raise CircuitOpenError(
+                        f"Circuit breaker '{self.name}' is open, upstream is failing",
+                        retry_after=remaining
+                    )
+                self._transition(self.HALF_OPEN)
+
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self._emit('circuit_breaker.rejected')
+                    raise CircuitOpenError(
+                        f"Circuit breaker '{self.name}' is half-open, trial request in flight"
+                    )
+                self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures        = 0
+            self._trial_in_flight = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures       += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open trial slot when the call ended without an upstream verdict"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        self._emit('circuit_breaker.transition', from_state=previous, to_state=state)
+        if self.metrics:
+            self.metrics.gauge('circuit_breaker.state', [self.CLOSED, self.HALF_OPEN, self.OPEN].index(state), breaker=self.name)
+
+    def _emit(self, name: str, **tags) -> None:
+        if self.metrics:
+            self.metrics.emit(name, breaker=self.name, **tags)
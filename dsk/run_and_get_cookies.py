@@ -6,6 +6,12 @@ import time
 import requests
 import json
 
+try:
+    from .fingerprint import FingerprintProfile
+except ImportError:
+    # Run as a plain script from inside dsk/
+    from fingerprint import FingerprintProfile
+
 def get_and_save_cookies(server_url, cookie_file_path):
     for attempt in range(5):
         try:
@@ -13,9 +19,12 @@ def get_and_save_cookies(server_url, cookie_file_path):
             response.raise_for_status()
             cookies_data = response.json()
 
+            user_agent = cookies_data.get('user_agent', '')
             cookies_to_save = {
                 'cookies': cookies_data.get('cookies', {}),
-                'user_agent': cookies_data.get('user_agent', '')
+                'user_agent': user_agent,
+                # Headers and TLS target the clearance must be presented with
+                'fingerprint': FingerprintProfile.from_user_agent(user_agent).to_dict() if user_agent else None
             }
 
             os.makedirs(os.path.dirname(cookie_file_path), exist_ok=True)
@@ -7,7 +7,7 @@ from CloudflareBypasser import CloudflareBypasser
 from DrissionPage import ChromiumPage, ChromiumOptions
 from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
 import argparse
 
 from pyvirtualdisplay import Display
@@ -15,11 +15,19 @@ import uvicorn
 import atexit
 import time
 
+try:
+    import psutil  # Optional, reports browser memory in X-Bypass-Profile
+except ImportError:
+    psutil = None
+
 # Check if running in Docker mode
 DOCKER_MODE = os.getenv("DOCKERMODE", "false").lower() == "true"
 
 SERVER_PORT = int(os.getenv("SERVER_PORT", 8000))
 
+# Allow local targets such as dsk/challenge_standin.py, for benchmarks only
+ALLOW_LOCAL_URLS = os.getenv("ALLOW_LOCAL_URLS", "false").lower() == "true"
+
 # Chromium options arguments
 arguments = [
     # "--remote-debugging-port=9222",  # Add this line for remote debugging
@@ -56,11 +64,30 @@ def is_safe_url(url: str) -> bool:
         r"^(127\.0\.0\.1|localhost|0\.0\.0\.0|::1|10\.\d+\.\d+\.\d+|172\.1[6-9]\.\d+\.\d+|172\.2[0-9]\.\d+\.\d+|172\.3[0-1]\.\d+\.\d+|192\.168\.\d+\.\d+)$"
     )
     hostname = parsed_url.hostname
-    if (hostname and ip_pattern.match(hostname)) or parsed_url.scheme == "file":
+    if parsed_url.scheme == "file":
+        return False
+    if hostname and ip_pattern.match(hostname) and not ALLOW_LOCAL_URLS:
         return False
     return True
 
 
+# Function to add the time since started to a phase of the bypass profile
+def record_phase(profile: dict, phase: str, started: float) -> None:
+    profile[phase] = profile.get(phase, 0.0) + time.perf_counter() - started
+
+
+# Function to measure the browser's resident memory, including its child processes
+def browser_rss(driver: ChromiumPage) -> Optional[int]:
+    pid = getattr(driver, "process_id", None)
+    if psutil is None or not pid:
+        return None
+    try:
+        browser = psutil.Process(pid)
+        return sum(process.memory_info().rss for process in [browser, *browser.children(recursive=True)])
+    except psutil.Error:
+        return None
+
+
 # Function to verify if the page has loaded properly
 def verify_page_loaded(driver: ChromiumPage) -> bool:
     """Verify if the page has loaded properly"""
@@ -74,10 +101,14 @@ def verify_page_loaded(driver: ChromiumPage) -> bool:
 
 
 # Function to bypass Cloudflare protection
-def bypass_cloudflare(url: str, retries: int, log: bool, proxy: str = None) -> ChromiumPage:
+def bypass_cloudflare(url: str, retries: int, log: bool, proxy: str = None, profile: dict = None) -> ChromiumPage:
     max_load_retries = 3
+    # Seconds spent launching the browser, loading the page and solving the challenge
+    profile = profile if profile is not None else {}
 
     for load_attempt in range(max_load_retries):
+        profile["load_attempts"] = load_attempt + 1
+        started = time.perf_counter()
         options = ChromiumOptions().auto_port()
         if DOCKER_MODE:
             options.set_argument("--auto-open-devtools-for-tabs", "true")
@@ -92,12 +123,19 @@ def bypass_cloudflare(url: str, retries: int, log: bool, proxy: str = None) -> C
             options.set_proxy(proxy)
 
         driver = ChromiumPage(addr_or_opts=options)
+        record_phase(profile, "launch", started)
+        # Phase in progress, so failed attempts still count towards it
+        phase = None
         try:
+            phase, started = "load", time.perf_counter()
             driver.get(url)
             # Wait for initial page load
             time.sleep(5)
 
-            if not verify_page_loaded(driver):
+            loaded = verify_page_loaded(driver)
+            record_phase(profile, phase, started)
+            phase = None
+            if not loaded:
                 driver.quit()
                 if load_attempt < max_load_retries - 1:
                     time.sleep(3)
@@ -105,10 +143,14 @@ def bypass_cloudflare(url: str, retries: int, log: bool, proxy: str = None) -> C
                 else:
                     raise Exception("Failed to load page properly after multiple attempts")
 
+            phase, started = "solve", time.perf_counter()
             cf_bypasser = CloudflareBypasser(driver, retries, log)
             cf_bypasser.bypass()
+            record_phase(profile, phase, started)
             return driver
         except Exception as e:
+            if phase is not None:
+                record_phase(profile, phase, started)
             driver.quit()
             if load_attempt < max_load_retries - 1:
                 time.sleep(3)
@@ -116,16 +158,27 @@ def bypass_cloudflare(url: str, retries: int, log: bool, proxy: str = None) -> C
             raise e
 
 
+# Endpoints are plain functions: the bypass blocks on the browser, so FastAPI
+# runs each request in its threadpool instead of on the event loop
+
 # Endpoint to get cookies
 @app.get("/cookies", response_model=CookieResponse)
-async def get_cookies(url: str, retries: int = 5, proxy: str = None):
+def get_cookies(response: Response, url: str, retries: int = 5, proxy: str = None):
     if not is_safe_url(url):
         raise HTTPException(status_code=400, detail="Invalid URL")
     try:
-        driver = bypass_cloudflare(url, retries, log, proxy)
+        profile = {}
+        started = time.perf_counter()
+        driver = bypass_cloudflare(url, retries, log, proxy, profile)
+        cookies_started = time.perf_counter()
         cookies = {cookie.get("name", ""): cookie.get("value", " ") for cookie in driver.cookies()}
         user_agent = driver.user_agent
+        record_phase(profile, "cookies", cookies_started)
+        profile["browser_rss_bytes"] = browser_rss(driver)
         driver.quit()
+        record_phase(profile, "total", started)
+        # Phase timings for benchmarks/bypass_load.py
+        response.headers["X-Bypass-Profile"] = json.dumps(profile)
         return CookieResponse(cookies=cookies, user_agent=user_agent)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -133,7 +186,7 @@ async def get_cookies(url: str, retries: int = 5, proxy: str = None):
 
 # Endpoint to get HTML content and cookies
 @app.get("/html")
-async def get_html(url: str, retries: int = 5, proxy: str = None):
+def get_html(url: str, retries: int = 5, proxy: str = None):
     if not is_safe_url(url):
         raise HTTPException(status_code=400, detail="Invalid URL")
     try:
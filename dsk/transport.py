@@ -0,0 +1,483 @@
+"""
+HTTP transports for DeepSeekAPI
+
+Every request the client makes goes through `transport.request(method, url,
+**kwargs)`, which returns an object with the curl_cffi response interface the
+client uses: status_code, headers, text, json() and iter_lines().
+
+- CurlTransport sends requests with curl_cffi (the default).
+- MultiplexTransport sends concurrent requests as HTTP/2 streams over one or
+  a few shared connections.
+- RecordingTransport wraps another transport and writes every exchange,
+  including the timing of each streamed SSE line, to a gzip JSONL trace with
+  credentials scrubbed.
+- ReplayTransport serves a trace back through the same client code, at the
+  recorded pace or as fast as possible, for offline tests and benchmarks.
+"""
+
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+TRACE_FORMAT  = 'dsk-trace'
+TRACE_VERSION = 1
+
+# Response headers worth keeping in a trace; everything else may identify the account
+RECORDED_HEADERS = ('content-type', 'retry-after')
+
+_version_checked = False
+
+def _check_curl_cffi_version() -> None:
+    """Warn once per process if the installed curl-cffi is not the tested version"""
+    global _version_checked
+    if _version_checked:
+        return
+    _version_checked = True
+
+    from importlib import metadata
+    try:
+        curl_cffi_version = metadata.version('curl-cffi')
+        if curl_cffi_version != '0.8.1b9':
+            print("\033[93mWarning: DeepSeek API requires curl-cffi version 0.8.1b9", file=sys.stderr)
+            print("Please install the correct version using: pip install curl-cffi==0.8.1b9\033[0m", file=sys.stderr)
+    except metadata.PackageNotFoundError:
+        print("\033[93mWarning: curl-cffi not found. Please install version 0.8.1b9:", file=sys.stderr)
+        print("pip install curl-cffi==0.8.1b9\033[0m", file=sys.stderr)
+
+def curl_requests():
+    """Import curl_cffi on first use; it dominates the import time of the package"""
+    _check_curl_cffi_version()
+    from curl_cffi import requests
+    return requests
+
+class CurlTransport:
+    def request(self, method: str, url: str, **kwargs: Any):
+        return curl_requests().request(method=method, url=url, **kwargs)
+
+class _RecordingResponse:
+    """Proxies a response and records what the client reads from it"""
+
+    def __init__(self, response, exchange: Dict[str, Any], received: float, sink: 'RecordingTransport'):
+        self._response = response
+        self._exchange = exchange
+        self._received = received
+        self._sink     = sink
+        self._written  = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+    @property
+    def text(self) -> str:
+        text = self._response.text
+        if not self._written:
+            self._exchange['body'] = text
+            self._write()
+        return text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_lines(self, *args, **kwargs) -> Iterator[bytes]:
+        lines = self._exchange.setdefault('lines', [])
+        try:
+            for line in self._response.iter_lines(*args, **kwargs):
+                # Offsets are relative to the response headers arriving
+                lines.append([round(time.perf_counter() - self._received, 6), line.decode('utf-8', 'replace')])
+                yield line
+        finally:
+            self._write()
+
+    def _write(self) -> None:
+        if not self._written:
+            self._written = True
+            self._sink.write(self._exchange)
+
+class RecordingTransport:
+    def __init__(self, path: Union[str, Path], inner: Optional[Any] = None):
+        self.path  = Path(path).expanduser()
+        self.inner = inner or CurlTransport()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, 'wt', encoding='utf-8')
+        self._file.write(json.dumps({'format': TRACE_FORMAT, 'version': TRACE_VERSION}) + '\n')
+        self._file.flush()
+
+    def request(self, method: str, url: str, **kwargs: Any):
+        started = time.perf_counter()
+        response = self.inner.request(method, url, **kwargs)
+        received = time.perf_counter()
+
+        parts = urlsplit(url)
+        exchange = {
+            'method': method,
+            'path': parts.path + (f'?{parts.query}' if parts.query else ''),
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if response.headers.get(name)},
+            # Request bodies only; authorization, cookies and PoW headers are never written
+            'request': kwargs.get('json'),
+            'latency': round(received - started, 6),
+        }
+        return _RecordingResponse(response, exchange, received, self)
+
+    def write(self, exchange: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(exchange, ensure_ascii=False, separators=(',', ':')) + '\n')
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if hasattr(self.inner, 'close'):
+            self.inner.close()
+
+def load_trace(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Read the exchanges of a trace file
+
+    Traces whose recorder was never closed, e.g. because the process was
+    killed, lack the gzip trailer; every exchange written before that is
+    still returned.
+    """
+    exchanges = []
+    with gzip.open(Path(path).expanduser(), 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('format') != TRACE_FORMAT or header.get('version') != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} {TRACE_FORMAT} file")
+        try:
+            # Each exchange is flushed as a whole line, so a truncated tail
+            # ends between lines
+            for line in f:
+                if line.strip():
+                    exchanges.append(json.loads(line))
+        except EOFError:
+            pass
+    return exchanges
+
+class ReplayResponse:
+    def __init__(self, exchange: Dict[str, Any], speed: Optional[float]):
+        self.status_code = exchange['status']
+        self.headers     = dict(exchange.get('headers', {}))
+        self._exchange   = exchange
+        self._speed      = speed
+        # Lines are encoded once up front so replays measure the client, not the trace
+        self._lines      = [(offset, line.encode('utf-8')) for offset, line in exchange.get('lines', ())]
+
+    @property
+    def text(self) -> str:
+        if 'body' in self._exchange:
+            return self._exchange['body']
+        return '\n'.join(line.decode('utf-8') for _, line in self._lines)
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_lines(self, *args, **kwargs) -> Iterator[bytes]:
+        if not self._speed:
+            for _, line in self._lines:
+                yield line
+            return
+
+        started = time.perf_counter()
+        for offset, line in self._lines:
+            delay = offset / self._speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+            yield line
+
+class ReplayTransport:
+    def __init__(self,
+                 trace: Union[str, Path, List[Dict[str, Any]]],
+                 speed: Optional[float] = None):
+        """
+        Args:
+            trace: Trace file, or exchanges already loaded with load_trace()
+            speed: 1.0 replays at the recorded pace, 2.0 twice as fast,
+                None as fast as possible
+        """
+        exchanges = trace if isinstance(trace, list) else load_trace(trace)
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._exchanges = defaultdict(list)
+        self._cursor    = defaultdict(int)
+        for exchange in exchanges:
+            self._exchanges[(exchange['method'].upper(), urlsplit(exchange['path']).path)].append(exchange)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> ReplayResponse:
+        key = (method.upper(), urlsplit(url).path)
+        with self._lock:
+            candidates = self._exchanges.get(key)
+            if not candidates:
+                raise LookupError(f"No recorded exchange for {method} {key[1]}")
+            # Exchanges for the same endpoint are served in order, then cycle
+            exchange = candidates[self._cursor[key] % len(candidates)]
+            self._cursor[key] += 1
+
+        if self.speed and exchange.get('latency'):
+            time.sleep(exchange['latency'] / self.speed)
+        return ReplayResponse(exchange, self.speed)
+
+class _Connection:
+    def __init__(self, connection_id: str):
+        self.id      = connection_id
+        self.session = None
+        self.active  = 0
+        self.served  = 0
+        self.retired = False
+
+class _MultiplexedResponse:
+    """Streaming response whose lines are pumped from the transport's event loop"""
+
+    _END = object()
+
+    def __init__(self, transport: 'MultiplexTransport', connection: _Connection, response):
+        self._transport  = transport
+        self._connection = connection
+        self._response   = response
+        self._closed     = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+    def iter_lines(self, *args, **kwargs) -> Iterator[bytes]:
+        import asyncio
+        import queue
+
+        lines = queue.Queue()
+
+        async def pump():
+            try:
+                async for line in self._response.aiter_lines(*args, **kwargs):
+                    lines.put(line)
+            except BaseException as e:
+                # e.g. GOAWAY or a reset connection in the middle of the stream
+                code = getattr(e, 'code', None)
+                if code in self._transport.CONNECTION_ERRORS:
+                    self._transport._retire(self._connection, reason=f'curl_{code}')
+                lines.put(e)
+            finally:
+                lines.put(self._END)
+
+        pumping = asyncio.run_coroutine_threadsafe(pump(), self._transport._loop)
+        try:
+            while True:
+                item = lines.get()
+                if item is self._END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            pumping.cancel()
+            self.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._transport._run(self._response.aclose())
+        except Exception:
+            pass
+        self._transport._release(self._connection)
+
+class MultiplexTransport:
+    """Multiplexes concurrent requests as HTTP/2 streams over a few connections
+
+    Each connection is an AsyncSession whose multi handle is capped at one
+    connection to the host, so its requests become streams on that connection.
+    New connections are opened only when every live one has
+    `max_streams_per_connection` streams in flight, up to `max_connections`;
+    beyond that requests wait for a free stream. A connection that fails at the
+    connection level (e.g. GOAWAY, refused stream) is retired and the request
+    is sent once more on a fresh one. If that happens while a response is
+    streaming, the connection is retired and the error reaches the reader.
+
+    Metrics: transport.connection_opened, transport.connection_closed{reason},
+    transport.active_streams{connection} (gauge), transport.streams_served{connection}
+    (gauge, streams carried by each closed connection) and transport.failover{code}.
+    """
+
+    # libcurl errors that mean the connection, not the request, is broken
+    CONNECTION_ERRORS = {
+        7,   # couldn't connect
+        16,  # HTTP/2 framing layer, e.g. GOAWAY
+        18,  # connection closed in the middle of a response
+        35,  # TLS handshake failed
+        52,  # got nothing
+        55,  # send error
+        56,  # receive error
+        92,  # HTTP/2 stream error, e.g. REFUSED_STREAM
+    }
+    # Of those, errors after which the server cannot have processed the request
+    FAILOVER_ERRORS = {7, 16, 35, 92}
+
+    def __init__(self,
+                 max_streams_per_connection: int = 32,
+                 max_connections: int = 2,
+                 metrics: Optional[Any] = None,
+                 **session_kwargs: Any):
+        self.max_streams_per_connection = max_streams_per_connection
+        self.max_connections            = max_connections
+        self.metrics                    = metrics
+        self.session_kwargs             = session_kwargs
+
+        self._cond        = threading.Condition()
+        self._connections: List[_Connection] = []
+        self._next_id     = 0
+        self._closing     = []
+        self._loop        = None
+        self._thread      = None
+
+    def _ensure_loop(self) -> None:
+        import asyncio
+
+        with self._cond:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='dsk-multiplex', daemon=True)
+            self._thread.start()
+
+    def _run(self, coro):
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _emit(self, name: str, value: float = 1, **tags: Any) -> None:
+        if self.metrics:
+            self.metrics.emit(name, value, **tags)
+
+    def _gauge_served(self, connection: _Connection) -> None:
+        if self.metrics:
+            self.metrics.gauge('transport.streams_served', connection.served, connection=connection.id)
+
+    def _gauge_streams(self, connection: _Connection) -> None:
+        if self.metrics:
+            self.metrics.gauge('transport.active_streams', connection.active, connection=connection.id)
+
+    def _acquire(self) -> _Connection:
+        with self._cond:
+            while True:
+                live = [c for c in self._connections if c.active < self.max_streams_per_connection]
+                if live:
+                    connection = min(live, key=lambda c: c.active)
+                elif len(self._connections) < self.max_connections:
+                    self._next_id += 1
+                    connection = _Connection(f'h2-{self._next_id}')
+                    self._connections.append(connection)
+                    self._emit('transport.connection_opened')
+                else:
+                    self._cond.wait()
+                    continue
+
+                connection.active += 1
+                connection.served += 1
+                self._gauge_streams(connection)
+                return connection
+
+    def _release(self, connection: _Connection) -> None:
+        with self._cond:
+            connection.active -= 1
+            self._gauge_streams(connection)
+            if connection.retired and connection.active == 0:
+                self._close_session(connection)
+            self._cond.notify()
+
+    def _retire(self, connection: _Connection, reason: str) -> None:
+        with self._cond:
+            if connection.retired:
+                return
+            connection.retired = True
+            self._connections.remove(connection)
+            self._emit('transport.connection_closed', reason=reason)
+            self._gauge_served(connection)
+            if connection.active == 0:
+                self._close_session(connection)
+            self._cond.notify_all()
+
+    def _close_session(self, connection: _Connection) -> None:
+        import asyncio
+
+        session, connection.session = connection.session, None
+        if session is not None:
+            self._closing.append(asyncio.run_coroutine_threadsafe(session.close(), self._loop))
+
+    async def _send(self, connection: _Connection, method: str, url: str, kwargs: Dict[str, Any]):
+        if connection.session is None:
+            connection.session = self._new_session()
+        return await connection.session.request(method, url, **kwargs)
+
+    def _new_session(self):
+        # Runs on the event loop thread, which AsyncCurl binds to
+        import asyncio
+        from curl_cffi import CurlMOpt, CurlOpt
+        from curl_cffi._wrapper import ffi
+        from curl_cffi.aio import AsyncCurl
+        from curl_cffi.requests import AsyncSession
+
+        multi = AsyncCurl(loop=asyncio.get_running_loop())
+        multi.setopt(CurlMOpt.PIPELINING, ffi.cast('void *', 2))  # CURLPIPE_MULTIPLEX
+        multi.setopt(CurlMOpt.MAX_HOST_CONNECTIONS, ffi.cast('void *', 1))
+        multi.setopt(CurlMOpt.MAX_CONCURRENT_STREAMS, ffi.cast('void *', self.max_streams_per_connection))
+
+        return AsyncSession(
+            async_curl=multi,
+            max_clients=self.max_streams_per_connection,
+            # Wait for the connection to confirm HTTP/2 instead of opening another
+            curl_options={CurlOpt.PIPEWAIT: 1},
+            **self.session_kwargs
+        )
+
+    def request(self, method: str, url: str, **kwargs: Any):
+        requests = curl_requests()
+        self._ensure_loop()
+
+        for attempt in range(2):
+            connection = self._acquire()
+            try:
+                response = self._run(self._send(connection, method, url, kwargs))
+            except requests.exceptions.RequestException as e:
+                self._release(connection)
+                code = getattr(e, 'code', None)
+                if code in self.CONNECTION_ERRORS:
+                    self._retire(connection, reason=f'curl_{code}')
+                    if code in self.FAILOVER_ERRORS and attempt == 0:
+                        self._emit('transport.failover', code=code)
+                        continue
+                raise
+
+            if kwargs.get('stream'):
+                return _MultiplexedResponse(self, connection, response)
+            self._release(connection)
+            return response
+
+    def close(self) -> None:
+        with self._cond:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.retired = True
+            self._emit('transport.connection_closed', reason='closed')
+            self._gauge_served(connection)
+            if connection.session is not None:
+                self._run(connection.session.close())
+                connection.session = None
+        if self._loop is not None:
+            for closing in self._closing:
+                try:
+                    closing.result()
+                except Exception:
+                    pass
+            self._closing = []
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
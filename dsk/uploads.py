@@ -0,0 +1,73 @@
+"""
+Local index of uploaded files
+
+Maps the SHA-256 of a file's content to the file ID DeepSeek assigned when it
+was uploaded, per account, so the same document is never uploaded twice. The
+index is a small JSON file rewritten atomically on every change.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a file, read in chunks so large files never sit in memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def account_key(auth_token: str) -> str:
+    """Stable identifier for an account that doesn't store the token itself"""
+    return hashlib.sha256(auth_token.encode()).hexdigest()[:16]
+
+class UploadIndex:
+    def __init__(self, path: Union[str, Path]):
+        self.path  = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if self._data is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._data = {}
+        return self._data
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, account: str, digest: str) -> Optional[str]:
+        """Return the file ID previously uploaded for this content, if any"""
+        with self._lock:
+            entry = self._load().get(account, {}).get(digest)
+            return entry['id'] if entry else None
+
+    def put(self, account: str, digest: str, file_id: str, file_name: str, size: int) -> None:
+        with self._lock:
+            self._load().setdefault(account, {})[digest] = {
+                'id': file_id,
+                'name': file_name,
+                'size': size,
+                'uploaded_at': int(time.time()),
+            }
+            self._save()
+
+    def forget(self, account: str, digest: str) -> None:
+        """Drop an entry, e.g. after the server has discarded the file"""
+        with self._lock:
+            if self._load().get(account, {}).pop(digest, None) is not None:
+                self._save()
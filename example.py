@@ -1,36 +1,35 @@
 from dsk.api import DeepSeekAPI, AuthenticationError, RateLimitError, NetworkError, APIError
+from dsk.aggregate import aggregate
 import sys, os
-from typing import Generator, Dict, Any
+from typing import Iterable, Dict, Any
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def print_response(chunks: Generator[Dict[str, Any], None, None]) -> None:
+def print_response(chunks: Iterable[Dict[str, Any]]) -> None:
     """Helper function to print response chunks in a clean format"""
-    thinking_lines = []
-    text_content = []
+    result = aggregate(chunks)
 
-    try:
-        for chunk in chunks:
-            if chunk['type'] == 'thinking':
-                if chunk['content'] and chunk['content'] not in thinking_lines:
-                    thinking_lines.append(chunk['content'])
-            elif chunk['type'] == 'text':
-                text_content.append(chunk['content'])
-    except KeyError as e:
-        print(f"❌ Error: Malformed response chunk - missing key {str(e)}")
-        return
-
-    if thinking_lines:
+    if result.thinking:
         print("\n🤔 Thinking:")
-        for line in thinking_lines:
-            print(f"  • {line}")
+        for line in result.thinking.splitlines():
+            if line.strip():
+                print(f"  • {line.strip()}")
         print()
 
     print("💬 Response:")
-    print(''.join(text_content))
+    print(result.text)
     print()
 
+    if result.citations:
+        print("🔗 Sources:")
+        for number, citation in enumerate(result.citations, 1):
+            print(f"  [{citation.index or number}] {citation.title or citation.url} - {citation.url}")
+        print()
+
+    if result.time_to_first_token is not None:
+        print(f"⏱️ {result.tokens} tokens in {result.elapsed:.1f}s, first after {result.time_to_first_token:.1f}s")
+
 def run_chat_example(api: DeepSeekAPI, title: str, prompt: str, thinking_enabled: bool = True, search_enabled: bool = False) -> None:
     """Run a chat example with error handling"""
     print(f"\n{title}")
@@ -0,0 +1,20 @@
+"""Streaming client benchmark, run on a synthetic trace"""
+
+from benchmarks.stream_replay import measure, synthetic_trace
+
+def test_stream_replay():
+    results = measure(synthetic_trace(500), repeat=3)
+
+    assert results['chunks'] == 500
+    for name in ('raw_chunks_per_s', 'parse_chunks_per_s', 'end_to_end_chunks_per_s'):
+        assert results[name] > 0
+    # A chunk is one small dict with its content string; more means the
+    # client started keeping per-chunk state
+    assert results['blocks_per_chunk'] < 10
+    assert results['bytes_per_chunk'] < 1024
+
+def test_allocations_do_not_count_the_trace():
+    small = measure(synthetic_trace(100), repeat=1)
+    large = measure(synthetic_trace(2000), repeat=1)
+
+    assert abs(large['blocks_per_chunk'] - small['blocks_per_chunk']) < 1